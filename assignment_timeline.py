@@ -0,0 +1,151 @@
+import bisect
+
+import numpy as np
+
+from time_utils import epoch_minutes
+
+# crew code in the high bits, epoch minutes in the low bits: one sortable int64 key
+TIME_BITS = 32
+
+
+class AssignmentTimeline():
+    """
+    Every crew member's assignments as (start, end, flight_id) lists in start order.
+    A crew member's assignments are expected not to overlap, so ends are sorted as
+    well and both the next assignment and the first conflict are one bisect.
+
+    Batch checks use flat copies of all timelines keyed by (crew code, minutes),
+    rebuilt lazily after changes, so many candidates are checked with two
+    searchsorted calls.
+    """
+
+    def __init__(self):
+        self.timelines = dict()
+        self.crew_codes = dict()
+        self._flat = None
+
+    def add(self, crew_id, flight_id, start, end):
+        """
+        Inserts one assignment, keeping the crew member's timeline in start order.
+        Adding a flight the crew member already has is a no-op.
+        """
+        start, end = epoch_minutes(start), epoch_minutes(end)
+        timeline = self.timelines.setdefault(crew_id, {"starts": [], "ends": [], "flight_ids": []})
+        if flight_id in timeline["flight_ids"]:
+            return
+        self.crew_codes.setdefault(crew_id, len(self.crew_codes))
+        index = bisect.bisect_right(timeline["starts"], start)
+        timeline["starts"].insert(index, start)
+        timeline["ends"].insert(index, end)
+        timeline["flight_ids"].insert(index, flight_id)
+        self._flat = None
+
+    def remove(self, crew_id, flight_id):
+        timeline = self.timelines.get(crew_id)
+        if timeline is None or flight_id not in timeline["flight_ids"]:
+            return
+        index = timeline["flight_ids"].index(flight_id)
+        for values in timeline.values():
+            values.pop(index)
+        self._flat = None
+
+    def _entry(self, timeline, index):
+        return {
+            "flight_id": timeline["flight_ids"][index],
+            "start": np.datetime64(timeline["starts"][index], "m"),
+            "end": np.datetime64(timeline["ends"][index], "m"),
+        }
+
+    def next_assignment(self, crew_id, after):
+        """
+        First assignment starting at or after the given time, or None.
+        """
+        timeline = self.timelines.get(crew_id)
+        if timeline is None:
+            return None
+        index = bisect.bisect_left(timeline["starts"], epoch_minutes(after))
+        return self._entry(timeline, index) if index < len(timeline["starts"]) else None
+
+    def first_conflict(self, crew_id, start, end, min_turn_minutes=0):
+        """
+        First assignment overlapping [start, end] widened by min_turn_minutes on both
+        sides, or None if the crew member is free for the whole window.
+        """
+        timeline = self.timelines.get(crew_id)
+        if timeline is None:
+            return None
+        start, end = epoch_minutes(start) - min_turn_minutes, epoch_minutes(end) + min_turn_minutes
+        index = bisect.bisect_right(timeline["ends"], start)
+        if index < len(timeline["starts"]) and timeline["starts"][index] < end:
+            return self._entry(timeline, index)
+        return None
+
+    def _flat_arrays(self):
+        if self._flat is None:
+            codes, starts, ends, flight_ids = [], [], [], []
+            for crew_id, timeline in self.timelines.items():
+                codes.extend([self.crew_codes[crew_id]] * len(timeline["starts"]))
+                starts.extend(timeline["starts"])
+                ends.extend(timeline["ends"])
+                flight_ids.extend(timeline["flight_ids"])
+
+            codes = np.array(codes, dtype=np.int64)
+            starts = np.array(starts, dtype=np.int64)
+            ends = np.array(ends, dtype=np.int64)
+            start_keys = (codes << TIME_BITS) | starts
+            order = np.argsort(start_keys, kind="stable")
+            self._flat = {
+                "codes": codes[order],
+                "starts": starts[order],
+                "ends": ends[order],
+                "start_keys": start_keys[order],
+                "end_keys": (codes[order] << TIME_BITS) | ends[order],
+                "flight_ids": np.array(flight_ids, dtype=object)[order],
+            }
+        return self._flat
+
+    def check_batch(self, crew_ids, start, end, min_turn_minutes=0):
+        """
+        Vectorized first_conflict and next_assignment for many candidates. start and
+        end are scalars or arrays aligned with crew_ids (datetime64[m]).
+
+        Returns:
+            dict of arrays aligned with crew_ids: conflict (bool), conflict_flight_id,
+            next_flight_id and next_start (None / NaT where there is none)
+        """
+        flat = self._flat_arrays()
+        n = len(crew_ids)
+        codes = np.array([self.crew_codes.get(crew_id, -1) for crew_id in crew_ids], dtype=np.int64)
+        start = np.broadcast_to(np.asarray(start, dtype="datetime64[m]").astype(np.int64), n)
+        end = np.broadcast_to(np.asarray(end, dtype="datetime64[m]").astype(np.int64), n)
+
+        result = {
+            "conflict": np.zeros(n, dtype=bool),
+            "conflict_flight_id": np.full(n, None, dtype=object),
+            "next_flight_id": np.full(n, None, dtype=object),
+            "next_start": np.full(n, np.datetime64("NaT", "m")),
+        }
+        known = codes >= 0
+        if not known.any() or flat["codes"].size == 0:
+            return result
+
+        last = flat["codes"].size - 1
+        safe_codes = np.maximum(codes, 0)
+
+        # first assignment of the crew member ending after the widened window start
+        first = np.searchsorted(flat["end_keys"], (safe_codes << TIME_BITS) | (start - min_turn_minutes), side="right")
+        first_clipped = np.minimum(first, last)
+        conflict = (
+            known & (first <= last) & (flat["codes"][first_clipped] == codes)
+            & (flat["starts"][first_clipped] < end + min_turn_minutes)
+        )
+
+        following = np.searchsorted(flat["start_keys"], (safe_codes << TIME_BITS) | end, side="left")
+        following_clipped = np.minimum(following, last)
+        has_next = known & (following <= last) & (flat["codes"][following_clipped] == codes)
+
+        result["conflict"] = conflict
+        result["conflict_flight_id"][conflict] = flat["flight_ids"][first_clipped[conflict]]
+        result["next_flight_id"][has_next] = flat["flight_ids"][following_clipped[has_next]]
+        result["next_start"][has_next] = flat["starts"][following_clipped[has_next]].astype("datetime64[m]")
+        return result
@@ -1,7 +1,7 @@
 from dotenv import load_dotenv
 from langchain.agents import initialize_agent, Tool, AgentType
 from tools import StatusQueryTools
-from mock_data import crew_roster_df, repositioning_flights_df, flight_schedule_df, hotels_df, transport_df, policies_df
+from mock_data import crew_roster_df, repositioning_flights_df, flight_schedule_df, hotels_df, transport_df, policies_df, crew_assignments_df
 from debug_llm import DebugLLMWrapper
 from helper import load_llm
 from prompt_templates import build_final_prompt, crew_disruption_prompt_v1
@@ -19,7 +19,8 @@ if __name__ == "__main__":
         repositioning_flights_df=repositioning_flights_df,
         hotels_df = hotels_df,
         transport_df=transport_df,
-        policies_df=policies_df
+        policies_df=policies_df,
+        crew_assignments_df=crew_assignments_df
     )
 
     agent = initialize_agent(
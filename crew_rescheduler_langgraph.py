@@ -2,7 +2,7 @@ from dataclasses import field, dataclass
 from typing import Dict, List, Any
 from langgraph.graph import END, StateGraph
 from tools import StatusQueryTools
-from mock_data import crew_roster_df, repositioning_flights_df, flight_schedule_df, hotels_df, transport_df, policies_df
+from mock_data import crew_roster_df, repositioning_flights_df, flight_schedule_df, hotels_df, transport_df, policies_df, crew_assignments_df
 import json
 
 @dataclass
@@ -51,7 +51,8 @@ status_tools = StatusQueryTools(
     repositioning_flights_df=repositioning_flights_df,
     hotels_df = hotels_df,
     transport_df=transport_df,
-    policies_df=policies_df
+    policies_df=policies_df,
+    crew_assignments_df=crew_assignments_df
 )
 
 def query_crew_roster_node(state: CrewDisruptionState):
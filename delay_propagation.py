@@ -0,0 +1,112 @@
+import bisect
+import heapq
+
+import numpy as np
+
+
+class PairingGraph():
+    """
+    Flight DAG built from crew pairings. Each crew member's assignments are kept in
+    departure order, and consecutive legs of the same crew member link the earlier
+    flight to the later one. A delay then only has to be relaxed along those links.
+
+    Flights are identified by their flight_schedule_df row position.
+    """
+
+    def __init__(self, sched_dep, sched_arr, min_turn_minutes=30):
+        self.sched_dep = sched_dep.astype(np.int64)
+        self.sched_arr = sched_arr.astype(np.int64)
+        self.min_turn_minutes = min_turn_minutes
+        self.crew_legs = dict()
+        self.flight_crew = dict()
+        self.successors = dict()
+
+    def _link(self, flight, next_flight, crew_id):
+        self.successors.setdefault(flight, dict()).setdefault(next_flight, set()).add(crew_id)
+
+    def _unlink(self, flight, next_flight, crew_id):
+        crew = self.successors.get(flight, {}).get(next_flight)
+        if crew is None:
+            return
+        crew.discard(crew_id)
+        if not crew:
+            del self.successors[flight][next_flight]
+
+    def add_assignment(self, crew_id, flight):
+        """
+        Inserts one leg into a crew member's pairing and relinks only its neighbours.
+        """
+        legs = self.crew_legs.setdefault(crew_id, [])
+        index = bisect.bisect_left(
+            legs, (self.sched_dep[flight], flight), key=lambda leg: (self.sched_dep[leg], leg)
+        )
+        if index < len(legs) and legs[index] == flight:
+            return
+
+        previous = legs[index - 1] if index > 0 else None
+        following = legs[index] if index < len(legs) else None
+        if previous is not None and following is not None:
+            self._unlink(previous, following, crew_id)
+        if previous is not None:
+            self._link(previous, flight, crew_id)
+        if following is not None:
+            self._link(flight, following, crew_id)
+
+        legs.insert(index, flight)
+        self.flight_crew.setdefault(flight, set()).add(crew_id)
+
+    def remove_assignment(self, crew_id, flight):
+        """
+        Removes one leg from a crew member's pairing, joining its neighbours directly.
+        """
+        legs = self.crew_legs.get(crew_id, [])
+        if flight not in legs:
+            return
+
+        index = legs.index(flight)
+        previous = legs[index - 1] if index > 0 else None
+        following = legs[index + 1] if index + 1 < len(legs) else None
+        if previous is not None:
+            self._unlink(previous, flight, crew_id)
+        if following is not None:
+            self._unlink(flight, following, crew_id)
+        if previous is not None and following is not None:
+            self._link(previous, following, crew_id)
+
+        legs.pop(index)
+        self.flight_crew[flight].discard(crew_id)
+
+    def propagate(self, flight, delay_minutes, current_delays):
+        """
+        Topological relaxation from one delayed flight. Flights are settled in
+        scheduled-departure order (every pairing link points forward in time), and a
+        successor is delayed to sched_arr + delay + min_turn of its latest inbound crew.
+        Only flights downstream of the delayed one are touched.
+
+        Args:
+            flight (int): delayed flight row position
+            delay_minutes (int): its new total delay
+            current_delays (np.ndarray): current delay per flight row, in minutes
+
+        Returns:
+            dict: { flight row position: propagated delay in minutes } for the delayed
+            flight and every downstream flight whose delay grows
+        """
+        delays = {flight: max(int(delay_minutes), 0)}
+        heap = [(self.sched_dep[flight], flight)]
+        settled = set()
+
+        while heap:
+            _, current = heapq.heappop(heap)
+            if current in settled:
+                continue
+            settled.add(current)
+
+            ready = self.sched_arr[current] + delays[current] + self.min_turn_minutes
+            for successor in self.successors.get(current, {}):
+                pushed = int(ready - self.sched_dep[successor])
+                if pushed > max(delays.get(successor, 0), int(current_delays[successor])):
+                    delays[successor] = pushed
+                    heapq.heappush(heap, (self.sched_dep[successor], successor))
+
+        return delays
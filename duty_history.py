@@ -0,0 +1,119 @@
+import bisect
+
+from time_utils import epoch_minutes
+
+# Rolling cumulative limits, evaluated over the window ending at the end of the planned duty.
+DEFAULT_DUTY_RULES = {
+    "rolling_limits": {
+        "flight_time_24h": {"kind": "flight", "window_minutes": 24 * 60, "max_minutes": 9 * 60},
+        "flight_time_28d": {"kind": "flight", "window_minutes": 672 * 60, "max_minutes": 100 * 60},
+        "duty_7d": {"kind": "duty", "window_minutes": 168 * 60, "max_minutes": 60 * 60},
+        "duty_28d": {"kind": "duty", "window_minutes": 672 * 60, "max_minutes": 190 * 60},
+    }
+}
+
+
+class DutyHistory():
+    """
+    Per-crew history of duty and flight-time intervals. Every (crew_id, kind) keeps
+    start and end arrays in time order plus a prefix sum of interval lengths, so the
+    total inside any rolling window is two binary searches and two subtractions.
+    Intervals of one crew member and kind are expected not to overlap.
+    """
+
+    def __init__(self):
+        self.intervals = dict()
+
+    @classmethod
+    def from_dataframe(cls, duty_history_df):
+        """
+        Builds the history from a dataframe with crew_id, kind ("duty" or "flight"), start and end.
+        """
+        history = cls()
+        if duty_history_df is None:
+            return history
+        for crew_id, kind, start, end in zip(
+            duty_history_df["crew_id"], duty_history_df["kind"],
+            duty_history_df["start"], duty_history_df["end"],
+        ):
+            history.add(crew_id, kind, start, end)
+        return history
+
+    def add(self, crew_id, kind, start, end):
+        """
+        Records one interval. Appending in time order is O(1); an out-of-order insert
+        rebuilds the prefix sums from the insertion point.
+        """
+        start, end = epoch_minutes(start), epoch_minutes(end)
+        if end <= start:
+            return
+
+        series = self.intervals.setdefault((crew_id, kind), {"starts": [], "ends": [], "prefix": [0]})
+        index = bisect.bisect_right(series["starts"], start)
+        series["starts"].insert(index, start)
+        series["ends"].insert(index, end)
+
+        prefix = series["prefix"]
+        del prefix[index + 1:]
+        for position in range(index, len(series["starts"])):
+            prefix.append(prefix[-1] + series["ends"][position] - series["starts"][position])
+
+    def total(self, crew_id, kind, window_start, window_end):
+        """
+        Minutes of kind recorded for crew_id inside [window_start, window_end],
+        with intervals crossing the window edges clipped to it.
+        """
+        return self._window_total(crew_id, kind, epoch_minutes(window_start), epoch_minutes(window_end))
+
+    def _window_total(self, crew_id, kind, window_start, window_end):
+        series = self.intervals.get((crew_id, kind))
+        if series is None:
+            return 0
+
+        starts, ends, prefix = series["starts"], series["ends"], series["prefix"]
+
+        first = bisect.bisect_right(ends, window_start)
+        last = bisect.bisect_left(starts, window_end)
+        if last <= first:
+            return 0
+
+        minutes = prefix[last] - prefix[first]
+        if starts[first] < window_start:
+            minutes -= window_start - starts[first]
+        if ends[last - 1] > window_end:
+            minutes -= ends[last - 1] - window_end
+        return minutes
+
+    def check_rolling_limits(self, crew_id, planned_start, planned_end, duty_rules, planned_flight_minutes=None):
+        """
+        Evaluates every rolling limit in duty_rules for a planned duty period added to
+        the recorded history. The planned period counts fully as duty; its flight time
+        is planned_flight_minutes. Flight-time limits are skipped when it is not given,
+        since duty time says nothing about how much of it is flown.
+
+        Returns:
+            list of dicts: one { limit, kind, total_minutes, max_minutes, legal } per rule
+        """
+        planned_start, planned_end = epoch_minutes(planned_start), epoch_minutes(planned_end)
+        planned_duty = planned_end - planned_start
+
+        results = []
+        for name, rule in duty_rules.get("rolling_limits", {}).items():
+            if rule["kind"] == "flight" and planned_flight_minutes is None:
+                continue
+            window_start = planned_end - rule["window_minutes"]
+            history_minutes = self._window_total(crew_id, rule["kind"], window_start, planned_end)
+            planned_minutes = min(planned_end - max(planned_start, window_start), planned_duty)
+            if rule["kind"] == "flight":
+                planned_minutes = min(planned_minutes, planned_flight_minutes)
+
+            total_minutes = history_minutes + planned_minutes
+            results.append({
+                "limit": name,
+                "kind": rule["kind"],
+                "total_minutes": int(total_minutes),
+                "max_minutes": rule["max_minutes"],
+                "legal": bool(total_minutes <= rule["max_minutes"]),
+            })
+
+        return results
@@ -0,0 +1,135 @@
+import numpy as np
+
+MINUTES_PER_DAY = 24 * 60
+
+# Maximum flight duty period in hours (FAR 117 style). Rows are report-time bands
+# starting at the listed time of day; columns are 1, 2, ... flight segments, the
+# last column covering that many segments or more.
+DEFAULT_FDP_RULES = {
+    "report_bands": ["00:00", "04:00", "05:00", "06:00", "07:00", "12:00", "13:00", "17:00", "22:00", "23:00"],
+    "max_fdp_hours": [
+        [9, 9, 9, 9, 9, 9, 9],
+        [10, 10, 10, 10, 9, 9, 9],
+        [12, 12, 12, 12, 11.5, 11, 10.5],
+        [13, 13, 12, 12, 11.5, 11, 10.5],
+        [14, 14, 13, 13, 12.5, 12, 11.5],
+        [13, 13, 13, 13, 12.5, 12, 11.5],
+        [12, 12, 12, 12, 11.5, 11, 10.5],
+        [12, 12, 11, 11, 10, 9, 9],
+        [11, 11, 10, 10, 9, 9, 9],
+        [10, 10, 10, 9, 9, 9, 9],
+    ],
+    "unacclimated_reduction_minutes": 30,
+    # augmented crews: pilots on board -> rows per band, columns per rest facility class 1..3
+    "augmented_bands": ["00:00", "06:00", "07:00", "13:00", "17:00"],
+    "augmented_max_fdp_hours": {
+        3: [[15, 14, 13], [16, 15, 14], [17, 16.5, 15], [16, 15, 14], [15, 14, 13]],
+        4: [[17, 15.5, 13.5], [18.5, 16.5, 14.5], [19, 18, 15.5], [18.5, 16.5, 14.5], [17, 15.5, 13.5]],
+    },
+}
+
+
+def _band_lookup(band_starts):
+    """
+    minute of day -> band row, so finding the band of any report time is one take.
+    """
+    starts = [int(hour) * 60 + int(minute) for hour, minute in (band.split(":") for band in band_starts)]
+    return (np.searchsorted(starts, np.arange(MINUTES_PER_DAY), side="right") - 1).astype(np.int16)
+
+
+class FDPLimits():
+    """
+    Flight duty period rules compiled into NumPy lookup arrays. Evaluating any number
+    of crew is a handful of array takes on small ints: report minute of day -> band,
+    (band, segments) -> max FDP, then the augmentation and acclimatization terms.
+    Compile once per rule set and reuse it for every call.
+    """
+
+    def __init__(self, fdp_rules=DEFAULT_FDP_RULES):
+        self.band_of_minute = _band_lookup(fdp_rules["report_bands"])
+        self.max_fdp = np.rint(np.asarray(fdp_rules["max_fdp_hours"], dtype=np.float64) * 60).astype(np.int32)
+        self.max_segments = self.max_fdp.shape[1]
+        self.unacclimated_reduction = int(fdp_rules.get("unacclimated_reduction_minutes", 0))
+
+        augmented = fdp_rules.get("augmented_max_fdp_hours") or {}
+        pilots = sorted(int(count) for count in augmented)
+        # pilots on board -> augmented table, -1 for an unaugmented crew
+        self.pilot_table = np.full(max(pilots, default=0) + 1, -1, dtype=np.int16)
+        self.pilot_table[pilots] = np.arange(len(pilots))
+        if pilots:
+            self.augmented_band_of_minute = _band_lookup(fdp_rules["augmented_bands"])
+            self.augmented_max_fdp = np.rint(
+                np.asarray([augmented.get(count, augmented.get(str(count))) for count in pilots], dtype=np.float64) * 60
+            ).astype(np.int32)
+
+    def max_fdp_minutes(self, report_time, segments=1, acclimated=True, pilots=2, rest_facility=1):
+        """
+        Maximum FDP in minutes per crew member. report_time is a datetime64[m] array;
+        the other arguments are scalars or arrays of the same length. NaT report
+        times get a limit of 0.
+
+        Returns:
+            np.ndarray: int32 max FDP minutes
+        """
+        report_time = np.asarray(report_time, dtype="datetime64[m]")
+        report_time, segments, acclimated, pilots, rest_facility = np.broadcast_arrays(
+            report_time, segments, acclimated, pilots, rest_facility
+        )
+        missing = np.isnat(report_time)
+        minute_of_day = np.where(missing, 0, report_time.astype(np.int64) % MINUTES_PER_DAY)
+
+        segment_column = np.clip(segments.astype(np.int64), 1, self.max_segments) - 1
+        limit = self.max_fdp[self.band_of_minute[minute_of_day], segment_column]
+
+        pilots = pilots.astype(np.int64)
+        table = np.where(
+            (pilots >= 0) & (pilots < len(self.pilot_table)),
+            self.pilot_table[np.clip(pilots, 0, len(self.pilot_table) - 1)],
+            -1,
+        )
+        augmented = table >= 0
+        if augmented.any():
+            rest_column = np.clip(rest_facility.astype(np.int64), 1, self.augmented_max_fdp.shape[2]) - 1
+            limit = np.where(
+                augmented,
+                self.augmented_max_fdp[
+                    np.maximum(table, 0), self.augmented_band_of_minute[minute_of_day], rest_column
+                ],
+                limit,
+            )
+
+        limit = limit - np.where(acclimated.astype(bool), 0, self.unacclimated_reduction)
+        return np.where(missing, 0, limit).astype(np.int32)
+
+    def evaluate(self, report_time, end_time, segments=1, acclimated=True, pilots=2, rest_facility=1):
+        """
+        FDP legality for many crew at once. FDP runs from report_time to end_time
+        (both datetime64[m]); a missing time is never legal.
+
+        Returns:
+            (np.ndarray, np.ndarray, np.ndarray): fdp_minutes (int64), max_fdp_minutes
+            (int32) and legal (bool), one entry per crew member
+        """
+        report_time = np.asarray(report_time, dtype="datetime64[m]")
+        end_time = np.asarray(end_time, dtype="datetime64[m]")
+        max_fdp = self.max_fdp_minutes(report_time, segments, acclimated, pilots, rest_facility)
+
+        missing = np.isnat(report_time) | np.isnat(end_time)
+        fdp = np.where(missing, 0, (end_time - report_time).astype(np.int64))
+        legal = ~missing & (fdp <= max_fdp)
+        return fdp, max_fdp, legal
+
+
+_compiled_limits = dict()
+
+
+def compiled_fdp_limits(fdp_rules=DEFAULT_FDP_RULES):
+    """
+    FDPLimits for a rule set, compiled on first use and reused by every later call
+    with equal rules.
+    """
+    key = repr(fdp_rules)
+    limits = _compiled_limits.get(key)
+    if limits is None:
+        limits = _compiled_limits.setdefault(key, FDPLimits(fdp_rules))
+    return limits
@@ -0,0 +1,172 @@
+import itertools
+import threading
+
+import numpy as np
+
+
+def _night(value):
+    return np.datetime64(value, "D")
+
+
+class RoomNightCalendar():
+    """
+    Rooms left per hotel per night over a fixed horizon of days. Every hotel is a
+    row of one lazy segment tree with range add and range min, laid out as a
+    hotels x nodes array; a night range maps to the same nodes for every hotel,
+    so "N rooms for nights D1..D2" is O(log days) per hotel and is answered for
+    all hotels at an airport with the same handful of column operations.
+    """
+
+    def __init__(self, hotels_df, first_night, days=30):
+        self.first_night = _night(first_night)
+        self.days = int(days)
+        self.size = 1
+        while self.size < self.days:
+            self.size *= 2
+        self.height = self.size.bit_length() - 1
+
+        self.rows = dict()
+        self.airport_rows = dict()
+        self.airport_names = dict()
+        self.bookings = dict()
+        self._booking_counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+        n_hotels = 0 if hotels_df is None else len(hotels_df)
+        # nights beyond the horizon inside the last power-of-two block never have rooms
+        self.tree = np.zeros((n_hotels, 2 * self.size), dtype=np.int64)
+        self.pending = np.zeros((n_hotels, self.size), dtype=np.int64)
+        if n_hotels == 0:
+            return
+
+        rooms = hotels_df["rooms_available"].to_numpy().astype(np.int64)
+        self.tree[:, self.size:self.size + self.days] = rooms[:, None]
+        for node in range(self.size - 1, 0, -1):
+            self.tree[:, node] = np.minimum(self.tree[:, 2 * node], self.tree[:, 2 * node + 1])
+
+        for row, (airport, name) in enumerate(zip(hotels_df["airport"], hotels_df["hotel_name"])):
+            self.rows[(airport, name)] = row
+            self.airport_rows.setdefault(airport, []).append(row)
+            self.airport_names.setdefault(airport, []).append(name)
+
+    def night_range(self, first_night, last_night):
+        """
+        Half-open leaf range for the nights first_night..last_night (inclusive).
+        Raises ValueError outside the calendar horizon.
+        """
+        start = int((_night(first_night) - self.first_night).astype(np.int64))
+        end = int((_night(last_night) - self.first_night).astype(np.int64)) + 1
+        if start < 0 or end > self.days or end <= start:
+            raise ValueError(
+                f"nights must fall within {self.first_night} .. {self.first_night + np.timedelta64(self.days - 1, 'D')}"
+            )
+        return start, end
+
+    def _apply(self, rows, node, delta):
+        self.tree[rows, node] += delta
+        if node < self.size:
+            self.pending[rows, node] += delta
+
+    def _rebuild(self, rows, node):
+        while node > 1:
+            node >>= 1
+            self.tree[rows, node] = (
+                np.minimum(self.tree[rows, 2 * node], self.tree[rows, 2 * node + 1]) + self.pending[rows, node]
+            )
+
+    def _push(self, rows, node):
+        for shift in range(self.height, 0, -1):
+            parent = node >> shift
+            delta = self.pending[rows, parent]
+            if np.any(delta):
+                self._apply(rows, 2 * parent, delta)
+                self._apply(rows, 2 * parent + 1, delta)
+                self.pending[rows, parent] = 0
+
+    def _range_add(self, rows, start, end, delta):
+        left, right = start + self.size, end + self.size
+        while left < right:
+            if left & 1:
+                self._apply(rows, left, delta)
+                left += 1
+            if right & 1:
+                right -= 1
+                self._apply(rows, right, delta)
+            left >>= 1
+            right >>= 1
+        self._rebuild(rows, start + self.size)
+        self._rebuild(rows, end - 1 + self.size)
+
+    def _range_min(self, rows, start, end):
+        left, right = start + self.size, end + self.size
+        self._push(rows, left)
+        self._push(rows, right - 1)
+        result = np.full(len(rows), np.iinfo(np.int64).max)
+        while left < right:
+            if left & 1:
+                result = np.minimum(result, self.tree[rows, left])
+                left += 1
+            if right & 1:
+                right -= 1
+                result = np.minimum(result, self.tree[rows, right])
+            left >>= 1
+            right >>= 1
+        return result
+
+    def availability(self, airport, first_night, last_night):
+        """
+        Rooms free on every night first_night..last_night for each hotel at airport.
+
+        Returns:
+            dict: { hotel_name: rooms }
+        """
+        rows = self.airport_rows.get(airport, [])
+        start, end = self.night_range(first_night, last_night)
+        if not rows:
+            return dict()
+        with self._lock:
+            rooms = self._range_min(np.array(rows), start, end)
+        return dict(zip(self.airport_names[airport], rooms.tolist()))
+
+    def reserve(self, airport, name, rooms, first_night, last_night, owner=None):
+        """
+        Takes rooms at one hotel for every night first_night..last_night if all of
+        those nights have them.
+
+        Returns:
+            dict: the booking record, or None if some night lacks rooms
+        """
+        row = self.rows.get((airport, name))
+        start, end = self.night_range(first_night, last_night)
+        if row is None:
+            return None
+        rows = np.array([row])
+        with self._lock:
+            if self._range_min(rows, start, end)[0] < rooms:
+                return None
+            self._range_add(rows, start, end, -rooms)
+            booking_id = f"{airport}-N{next(self._booking_counter)}"
+            booking = {
+                "booking_id": booking_id,
+                "airport": airport,
+                "name": name,
+                "rooms": rooms,
+                "first_night": str(_night(first_night)),
+                "last_night": str(_night(last_night)),
+                "owner": owner,
+            }
+            self.bookings[booking_id] = booking
+        return dict(booking)
+
+    def release(self, booking_id):
+        """
+        Gives a booking's rooms back for all of its nights. Returns the released
+        booking record, or None if there is no such booking.
+        """
+        with self._lock:
+            booking = self.bookings.pop(booking_id, None)
+            if booking is None:
+                return None
+            start, end = self.night_range(booking["first_night"], booking["last_night"])
+            self._range_add(np.array([self.rows[(booking["airport"], booking["name"])]]), start, end, booking["rooms"])
+        return booking
@@ -0,0 +1,92 @@
+import numpy as np
+
+LEAF_SIZE = 16
+
+
+class IntervalTree():
+    """
+    Static centered interval tree over closed intervals [start, end] given as int64
+    or datetime64 arrays. Every node keeps the intervals that contain its center,
+    sorted once by start and once by end, so a stabbing or overlap query is a
+    binary search per node on one root-to-leaf path plus the matches: O(log n + k).
+    Intervals with a missing (NaT) endpoint are left out.
+    """
+
+    def __init__(self, starts, ends):
+        starts = np.asarray(starts)
+        ends = np.asarray(ends)
+        if starts.dtype.kind == "M":
+            valid = ~np.isnat(starts) & ~np.isnat(ends)
+            starts, ends = starts.astype("datetime64[m]").astype(np.int64), ends.astype("datetime64[m]").astype(np.int64)
+        else:
+            valid = np.ones(len(starts), dtype=bool)
+
+        self.starts = starts.astype(np.int64)
+        self.ends = ends.astype(np.int64)
+        positions = np.flatnonzero(valid & (self.starts <= self.ends))
+        self.root = self._build(positions) if positions.size else None
+
+    def _build(self, positions):
+        starts, ends = self.starts[positions], self.ends[positions]
+        if positions.size <= LEAF_SIZE:
+            return {"leaf": positions, "starts": starts, "ends": ends}
+
+        center = int(np.median(np.concatenate([starts, ends])))
+        left = ends < center
+        right = starts > center
+        here = positions[~left & ~right]
+
+        by_start = here[np.argsort(self.starts[here], kind="stable")]
+        by_end = here[np.argsort(self.ends[here], kind="stable")]
+        return {
+            "center": center,
+            "by_start": by_start,
+            "sorted_starts": self.starts[by_start],
+            "by_end": by_end,
+            "sorted_ends": self.ends[by_end],
+            "left": self._build(positions[left]) if left.any() else None,
+            "right": self._build(positions[right]) if right.any() else None,
+        }
+
+    def overlapping(self, query_start, query_end):
+        """
+        Positions of every interval that shares at least one point with [query_start, query_end].
+        """
+        query_start, query_end = self._minutes(query_start), self._minutes(query_end)
+        found = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            if "leaf" in node:
+                found.append(node["leaf"][(node["starts"] <= query_end) & (node["ends"] >= query_start)])
+                continue
+
+            if query_end < node["center"]:
+                # node intervals all reach the center, so only their starts can miss
+                cutoff = np.searchsorted(node["sorted_starts"], query_end, side="right")
+                found.append(node["by_start"][:cutoff])
+                next_nodes = [node["left"]]
+            elif query_start > node["center"]:
+                cutoff = np.searchsorted(node["sorted_ends"], query_start, side="left")
+                found.append(node["by_end"][cutoff:])
+                next_nodes = [node["right"]]
+            else:
+                found.append(node["by_start"])
+                next_nodes = [node["left"], node["right"]]
+            stack.extend(child for child in next_nodes if child is not None)
+
+        if not found:
+            return np.array([], dtype=np.int64)
+        return np.sort(np.concatenate(found))
+
+    def stabbing(self, point):
+        """
+        Positions of every interval containing point.
+        """
+        return self.overlapping(point, point)
+
+    @staticmethod
+    def _minutes(value):
+        if isinstance(value, np.datetime64):
+            return int(value.astype("datetime64[m]").astype(np.int64))
+        return int(value)
@@ -1,3 +1,12 @@
+import numpy as np
+import pandas as pd
+
+from assignment_timeline import AssignmentTimeline
+from duty_history import DutyHistory
+from fdp_rules import compiled_fdp_limits
+from time_utils import parse_time
+
+
 def main():
     print("Hello from united-airline-hackathon!")
 
@@ -84,7 +93,10 @@ def query_spare_pool(location, aircraft_type, role, crew_roster_df):
 
 
 
-def duty_hour_checker(crew_id, planned_start, planned_end, duty_rules):
+def duty_hour_checker(
+    crew_id, planned_start, planned_end, duty_rules, duty_history=None, planned_flight_minutes=None,
+    segments=1, acclimated=True, pilots=2, rest_facility=1,
+):
 
     """
 
@@ -98,15 +110,57 @@ def duty_hour_checker(crew_id, planned_start, planned_end, duty_rules):
 
     planned_end (datetime)
 
-    duty_rules (dict)
+    duty_rules (dict): "rolling_limits" as in duty_history.DEFAULT_DUTY_RULES and/or "fdp_limits" as in fdp_rules.DEFAULT_FDP_RULES
+
+    duty_history (DutyHistory, optional): recorded duty and flight-time intervals per crew
+
+    planned_flight_minutes (int, optional): flight time within the planned duty; flight-time limits are only checked when given
+
+    segments (int), acclimated (bool), pilots (int), rest_facility (int): FDP table lookup keys
 
     Returns:
 
-    dict: { legal: bool, reason: str if not legal }
+    dict: { legal: bool, reason: str if not legal, rolling_limits: list of per-rule totals, fdp: dict if fdp_limits given }
 
     """
 
-    pass
+    # Step 1: Reject periods that end before they start
+    if planned_end <= planned_start:
+        return {"legal": False, "reason": "planned_end must be after planned_start"}
+
+    # Step 2: Add the planned period to each rolling window of the recorded history
+    history = duty_history if duty_history is not None else DutyHistory()
+    rolling_limits = history.check_rolling_limits(
+        crew_id, planned_start, planned_end, duty_rules, planned_flight_minutes
+    )
+
+    # Step 3: Check the flight duty period against the compiled FDP table
+    fdp = None
+    if duty_rules.get("fdp_limits"):
+        fdp_minutes, max_fdp_minutes, fdp_legal = compiled_fdp_limits(duty_rules["fdp_limits"]).evaluate(
+            [parse_time(planned_start)], [parse_time(planned_end)], segments, acclimated, pilots, rest_facility
+        )
+        fdp = {
+            "fdp_minutes": int(fdp_minutes[0]),
+            "max_fdp_minutes": int(max_fdp_minutes[0]),
+            "legal": bool(fdp_legal[0]),
+        }
+
+    result = {"legal": True, "rolling_limits": rolling_limits}
+    if fdp is not None:
+        result["fdp"] = fdp
+
+    # Step 4: Report the first exceeded limit, if any
+    exceeded = [limit for limit in rolling_limits if not limit["legal"]]
+    if fdp is not None and not fdp["legal"]:
+        result["legal"] = False
+        result["reason"] = f"flight duty period exceeded: {fdp['fdp_minutes']} of {fdp['max_fdp_minutes']} minutes"
+    elif exceeded:
+        limit = exceeded[0]
+        result["legal"] = False
+        result["reason"] = f"{limit['limit']} exceeded: {limit['total_minutes']} of {limit['max_minutes']} minutes"
+
+    return result
 
 
 
@@ -248,7 +302,9 @@ def check_weather_conditions(airport_code, weather_data):
 
 
 
-def check_crew_future_assignment(crew_id, crew_roster_df):
+def check_crew_future_assignment(
+    crew_id, crew_roster_df, assignment_timeline=None, proposed_start=None, proposed_end=None, min_turn_minutes=0,
+):
 
     """
 
@@ -260,13 +316,40 @@ def check_crew_future_assignment(crew_id, crew_roster_df):
 
     crew_roster_df (DataFrame)
 
+    assignment_timeline (AssignmentTimeline, optional): per-crew assignments; built from the roster's assigned_flight_id, duty_start and duty_end if not given
+
+    proposed_start (datetime, optional), proposed_end (datetime, optional): window the spare would fly; without it only the next assignment is looked up
+
+    min_turn_minutes (int): required gap between assignments
+
     Returns:
 
-    dict: { next_assignment, conflict: bool }
+    dict: { next_assignment, conflict: bool, conflict_flight_id }
 
     """
 
-    pass
+    # Step 1: Fall back to a one-assignment timeline from the roster
+    if assignment_timeline is None:
+        assignment_timeline = AssignmentTimeline()
+        crew = crew_roster_df[crew_roster_df['crew_id'] == crew_id]
+        for _, row in crew.iterrows():
+            if pd.notna(row['assigned_flight_id']) and pd.notna(row['duty_start']) and pd.notna(row['duty_end']):
+                assignment_timeline.add(crew_id, row['assigned_flight_id'], row['duty_start'], row['duty_end'])
+
+    # Step 2: Bisect for the first overlapping assignment and the next one after the window
+    conflict = None
+    after = proposed_end
+    if proposed_start is not None and proposed_end is not None:
+        conflict = assignment_timeline.first_conflict(crew_id, proposed_start, proposed_end, min_turn_minutes)
+    elif after is None:
+        after = proposed_start if proposed_start is not None else np.datetime64("1970-01-01", "m")
+    next_assignment = assignment_timeline.next_assignment(crew_id, after)
+
+    return {
+        "next_assignment": None if next_assignment is None else next_assignment["flight_id"],
+        "conflict": conflict is not None,
+        "conflict_flight_id": None if conflict is None else conflict["flight_id"],
+    }
 
 
 
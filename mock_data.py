@@ -14,6 +14,18 @@ flight_schedule_df = pd.DataFrame([
         "gate": "C5",
         "remarks": "ground stop"
     },
+    {
+        "flight_id": "UA789",
+        "origin": "SFO",
+        "destination": "ORD",
+        "sched_dep": "2024-08-10 15:00",
+        "sched_arr": "2024-08-10 19:00",
+        "aircraft_type": "B737",
+        "delay_minutes": 0,
+        "status": "ontime",
+        "gate": "A3",
+        "remarks": ""
+    },
     {
         "flight_id": "UA456",
         "origin": "SFO",
@@ -80,6 +92,14 @@ crew_roster_df = pd.DataFrame([
     }
 ])
 
+#  Crew Assignments (every leg of each crew member's pairing)
+crew_assignments_df = pd.DataFrame([
+    {"crew_id": "C001", "flight_id": "UA123"},
+    {"crew_id": "C001", "flight_id": "UA789"},
+    {"crew_id": "C002", "flight_id": "UA123"},
+    {"crew_id": "C002", "flight_id": "UA789"},
+])
+
 #  Hotel Inventory 
 hotel_inventory_df = pd.DataFrame([
     {
@@ -120,7 +140,7 @@ repositioning_flights_df = pd.DataFrame([
         "destination": "SFO",
         "sched_dep": "2024-08-10 10:00",
         "sched_arr": "2024-08-10 12:00",
-        "seats_available": True
+        "seats_available": 2
     },
     {
         "flight_id": "UA9002",
@@ -128,7 +148,7 @@ repositioning_flights_df = pd.DataFrame([
         "destination": "ORD",
         "sched_dep": "2024-08-10 11:00",
         "sched_arr": "2024-08-10 13:00",
-        "seats_available": False
+        "seats_available": 0
     },
     {
         "flight_id": "UA9003",
@@ -136,7 +156,7 @@ repositioning_flights_df = pd.DataFrame([
         "destination": "ORD",
         "sched_dep": "2024-08-10 09:00",
         "sched_arr": "2024-08-10 15:00",
-        "seats_available": True
+        "seats_available": 3
     }
 ])
 
@@ -0,0 +1,74 @@
+import re
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(["a", "an", "and", "at", "for", "in", "is", "of", "on", "or", "the", "to", "with"])
+
+
+def tokenize(text):
+    """
+    Lowercased alphanumeric tokens without stopwords.
+    """
+    if not isinstance(text, str):
+        return []
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class PolicyIndex():
+    """
+    BM25 inverted index over policy clauses, built once at load. Each term maps to
+    the clauses containing it and its precomputed BM25 weight in each, so a query
+    only touches the postings of its own terms: one vectorized add per query term
+    and a partial sort for the top k.
+    """
+
+    def __init__(self, policies_df, text_columns=("topic", "policy"), k1=1.5, b=0.75):
+        self.policies_df = policies_df
+        self.postings = dict()
+        n_docs = 0 if policies_df is None else len(policies_df)
+        self.n_docs = n_docs
+        if n_docs == 0:
+            return
+
+        columns = [column for column in text_columns if column in policies_df.columns]
+        documents = [
+            tokenize(" ".join(str(value) for value in values if isinstance(value, str)))
+            for values in zip(*(policies_df[column] for column in columns))
+        ]
+        lengths = np.array([len(tokens) for tokens in documents], dtype=np.float64)
+        average_length = max(lengths.mean(), 1.0)
+
+        frequencies = dict()
+        for doc, tokens in enumerate(documents):
+            for token in tokens:
+                counts = frequencies.setdefault(token, dict())
+                counts[doc] = counts.get(doc, 0) + 1
+
+        for token, counts in frequencies.items():
+            docs = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+            tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+            idf = np.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            weights = idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[docs] / average_length))
+            self.postings[token] = (docs, weights)
+
+    def search(self, query, top_k=3):
+        """
+        Best matching policy rows for a free-text query.
+
+        Returns:
+            list of (row position, score), best first; empty when no term matches
+        """
+        scores = np.zeros(self.n_docs)
+        for token in set(tokenize(query)):
+            posting = self.postings.get(token)
+            if posting is not None:
+                scores[posting[0]] += posting[1]
+
+        matched = np.flatnonzero(scores > 0)
+        if matched.size == 0:
+            return []
+        top_k = max(1, min(int(top_k), matched.size))
+        top = matched[np.argpartition(-scores[matched], top_k - 1)[:top_k]]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(row), float(scores[row])) for row in top]
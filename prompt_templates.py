@@ -15,8 +15,12 @@ def crew_disruption_prompt_v1(current_flight_data):
                 - duty_hour_checker: Checks crew duty legality.
                 - query_spare_pool: Finds spare crew.
                 - reposition_flight_finder: Finds repositioning flights.
+                - book_reposition_seat: Books a seat on a repositioning flight.
+                - confirm_reservation: Confirms a tentative seat, hotel or transport hold.
+                - release_reservation: Cancels a seat, hotel or transport booking.
                 - book_hotel: Books hotel accommodation.
                 - arrange_transport: Arranges ground transport.
+                - arrange_pooled_transport: Arranges shared ground transport for the crews of many flights.
                 - policy_retriever: Retrieves relevant operational policy.
                 - send_notification: Sends notifications.
 
@@ -47,7 +51,9 @@ def policy_retriever_instruction():
     - Use when no operational options remain, and you need policy guidance.
     - Provide Action Input as JSON with:
     • "topic": specific topic describing the situation (e.g. "crew disruption at ORD").
-    - The topic must be based on the actual issue you are addressing.
+    • "top_k" (optional): how many ranked policies to return (default 3).
+    - The topic must be based on the actual issue you are addressing; free text is matched against policy topics and wording.
+    - "policy" in the result is the best match; "policies" lists the ranked matches with their scores.
         """
 
 def arrange_transport_instruction():
@@ -66,6 +72,18 @@ def arrange_transport_instruction():
     - Do not assume transport success without using this tool and observing its output.
         """
 
+def arrange_pooled_transport_instruction():
+    return """
+    When you use the `arrange_pooled_transport` tool:
+
+    - Call this tool instead of repeated `arrange_transport` calls when the crews of several flights need transport from the same airport, so crews heading to the same hotel share vehicles.
+    - The Action Input must include:
+    • "requests": a list of {"flight_id", "airport", "hotel", "crew_ids", "ready_time" (YYYY-MM-DD HH:MM)} entries, one per flight and hotel.
+    - Optionally include "window_minutes" (how long a vehicle waits for more crews, default 20) and "hold_minutes".
+    - The Action Input must be valid JSON.
+    - Use the hotel names from the hotel bookings. Handle every flight in "unplaced_flight_ids" with fallback actions.
+        """
+
 def book_hotel_instruction():
     return """
     When you use the `book_hotel` tool:
@@ -78,7 +96,35 @@ def book_hotel_instruction():
     • "crew_ids": a list of crew members needing accommodation.
     - The Action Input must be valid JSON.
     - Do not assume a hotel booking succeeded. Use the tool and base your next reasoning step on its actual output (e.g., booked hotel name or failure message).
-    - If no hotel is available, reason about fallback actions (such as trying another airport hotel, arranging transport, or querying policy).
+    - If no single hotel has enough rooms the crew is split across several hotels; the output then lists "allocations" with the hotel, crew_ids and reservation_id of each part. Arrange transport to each of those hotels.
+    - If no hotel is available, the airport's hotels are full; reason about fallback actions (such as arranging transport to another airport or querying policy).
+        """
+
+def book_hotel_nights_instruction():
+    return """
+    When you use the `hotel_night_availability` or `book_hotel_nights` tools:
+
+    - Use them instead of `book_hotel` when the crew must stay more than one night, e.g. when a disruption runs over several days.
+    - The Action Input must include:
+    • "airport": the airport code where the crew are stranded (e.g., "ORD").
+    • "first_night" and "last_night": the first and last night of the stay (YYYY-MM-DD).
+    • "crew_ids": the crew needing rooms (for `book_hotel_nights` only).
+    - Rooms booked with `book_hotel` or `book_hotels_batch` are the first night's rooms and count against these tools too.
+    - The Action Input must be valid JSON.
+    - A stay may be split across hotels; the output lists "allocations" with hotel, crew_ids and reservation_id. Use `release_reservation` with that reservation_id to cancel.
+        """
+
+def book_hotels_batch_instruction():
+    return """
+    When you use the `book_hotels_batch` tool:
+
+    - Call this tool instead of repeated `book_hotel` calls when the crew of several flights are stranded at the same airport.
+    - The Action Input must include:
+    • "airport": the airport code where the crew are stranded (e.g., "ORD").
+    • "requests": a list of {"flight_id": ..., "crew_ids": [...]} entries, one per flight.
+    - Optionally include "hold_minutes" to place tentative holds.
+    - The Action Input must be valid JSON.
+    - Each entry in "results" either has "allocations" (hotel, crew_ids and reservation_id per hotel) or a failure message; handle the failed requests with fallback actions.
         """
 
 def reposition_flight_finder_instruction():
@@ -92,15 +138,57 @@ def reposition_flight_finder_instruction():
     • "sched_dep": the original scheduled departure time of the flight (YYYY-MM-DD HH:MM).
     • "delay_minutes": the total delay in minutes.
     • "report_buffer": the minimum minutes before projected departure by which the crew must arrive. This value will be provided in the prompt (do not make up a value).
+    - Optionally include "earliest_departure" (YYYY-MM-DD HH:MM), e.g. the spare's rest_until, so the crew is not booked on a flight before their rest ends.
     - The Action Input must be valid JSON.
+    - If no direct flight meets required_time, the tool may return an "itinerary" of connecting flights instead. Treat a returned itinerary as a valid repositioning option.
     - When evaluating reposition flights, carefully compare sched_arr against required_time to determine suitability.
     - Do not dismiss a reposition flight that meets required_time.
-    - When multiple repositioning flights are available, reason about and attempt them in order of earliest sched_arr that meets the required time.
-    - If the first chosen repositioning flight fails (for example, becomes unavailable), attempt the next available repositioning flight before moving to fallback actions or adding to the affected list.
+    - The tool returns up to "max_options" (default 3) feasible flights in "available_flights", ordered by earliest sched_arr, each with its seat count.
+    - When multiple repositioning flights are available, reason about and attempt them in the returned order.
+    - If the first chosen repositioning flight fails (for example, becomes unavailable), attempt the next flight from "available_flights" without calling the tool again, before moving to fallback actions or adding to the affected list.
     - If no repositioning flight is found for a spare crew member, and no other spare crew are available or suitable, you must use `add_affected_crew` to record the unresolved role.
     - Do not assume a repositioning flight is available. Always base your next step on the tool's actual output.
         """
 
+def batch_reposition_finder_instruction():
+    return """
+    When you use the `batch_reposition_finder` tool:
+
+    - Call this tool when `query_spare_pool` returned several spare crew members and you need to know which of them can be repositioned in time, instead of calling `reposition_flight_finder` once per spare.
+    - The Action Input must include:
+    • "crew_ids": the crew IDs of the spare candidates.
+    • "to_airport", "sched_dep", "delay_minutes" and "report_buffer": the same values you would pass to `reposition_flight_finder`.
+    - The Action Input must be valid JSON.
+    - The tool returns one option per candidate with "feasible" and, when feasible, the "itinerary" of reposition flights. Only consider candidates marked feasible.
+        """
+
+def book_reposition_seat_instruction():
+    return """
+    When you use the `book_reposition_seat` tool:
+
+    - Call this tool once you have chosen a repositioning flight for a spare crew member, to secure the seat before assigning the spare.
+    - The Action Input must include:
+    • "flight_id": the repositioning flight chosen from `reposition_flight_finder` or `batch_reposition_finder`.
+    • "crew_id": the spare crew member being repositioned.
+    - The Action Input must be valid JSON.
+    - If the tool reports no seats left, try the next repositioning option instead of assuming the seat is yours.
+    - While you are still evaluating a plan, add "hold_minutes" (e.g. 15) to place a tentative hold instead of a booking. The same option works for `book_hotel` and `arrange_transport`.
+    - Once the plan is final, call `confirm_reservation` with the returned "reservation_id". Unconfirmed holds expire and the inventory is returned.
+    - If a plan changes after booking, use `release_reservation` with the returned "reservation_id" to give the seat (or a hotel or transport booking) back.
+        """
+
+def plan_network_recovery_instruction():
+    return """
+    When you use the `plan_network_recovery` tool:
+
+    - Call this tool when several delayed flights need spare crew at the same time (for example during a hub ground stop), instead of resolving each flight with `query_spare_pool` one at a time.
+    - The Action Input must include:
+    • "report_buffer": the value provided in the prompt.
+    • "flight_ids" (optional): the flights to plan for. Leave it out to plan for every delayed flight.
+    - The Action Input must be valid JSON.
+    - The tool only proposes a plan. Book the listed reposition flights with `book_reposition_seat`, and treat positions under "uncovered" like a failed spare search for that role.
+        """
+
 def query_spare_pool_instruction():
     return """
     When you use the `query_spare_pool` tool:
@@ -110,6 +198,11 @@ def query_spare_pool_instruction():
     • "required_role": the role of the crew member to be replaced (e.g., "captain", "FO").
     • "qualified_aircraft": the aircraft type the replacement must be qualified for (e.g., "B737").
     • "exclude_crew_ids": a list of crew IDs already assigned to the flight. This ensures you do not select a current non-legal crew member as a spare.
+    - To get only the best spares ranked by rest, base and reposition arrival, also include:
+    • "top_k": how many ranked spares to return (e.g. 3).
+    • "departure_airport": the flight's origin airport.
+    • "sched_dep", "delay_minutes" and "report_buffer": the same values you would pass to `reposition_flight_finder`.
+    - Ranked spares are returned best first. Attempt them in the returned order. "reposition_flight_ids" lists the reposition flights, with connections, that bring a spare to the departure airport in time.
     - The Action Input must be valid JSON.
     - When multiple crew members are affected (e.g., both captain and FO are not legal), reason about replacements one role at a time. For each affected role, use this tool to search for suitable spare crew and process them before moving to the next affected role.
     - When multiple spare crew are found for a role, reason about which one to attempt first. If the first spare’s repositioning fails, attempt the next available spare before adding the role to the affected list.
@@ -117,6 +210,31 @@ def query_spare_pool_instruction():
     - After all spare crew and repositioning options for a given role have been exhausted, add the unresolved crew member to the affected list using the `add_affected_crew` tool before proceeding to fallback actions.
     - Do not assume spare crew availability. Always reason based on the actual tool output.
         """
+def delay_headroom_check_instruction():
+    return """
+    When you use the `delay_headroom_check` tool:
+
+    - Call this tool first for a delayed flight, before querying the roster or checking duty hours.
+    - The Action Input must include:
+    • "flight_id": the flight identifier (e.g., "UA123").
+    • "delay_minutes": the total delay in minutes.
+    - The Action Input must be valid JSON.
+    - If "within_headroom" is true, every assigned crew member stays legal. Conclude that no crew action is needed.
+    - If "within_headroom" is false, continue with `query_crew_roster` and `duty_hour_checker` as usual.
+        """
+
+def delay_propagation_instruction():
+    return """
+    When you use the `delay_propagation` tool:
+
+    - Call this tool after you have confirmed a delay, to find later flights flown by the same crew that the delay pushes back.
+    - The Action Input must include:
+    • "flight_id": the delayed flight.
+    • "delay_minutes": the total delay in minutes.
+    - The Action Input must be valid JSON.
+    - Treat each entry in "crew_legality_changes" with status "not legal" as a crew member who needs replacement on that downstream flight, and mention the affected downstream flights in your notifications.
+        """
+
 def duty_hour_checker_instruction():
     return """
     When you use the `duty_hour_checker` tool:
@@ -126,8 +244,35 @@ def duty_hour_checker_instruction():
     • "crew_ids": a list of crew IDs assigned to the flight.
     • "sched_arr": the flight's original scheduled arrival time (YYYY-MM-DD HH:MM).
     • "delay_minutes": the total delay in minutes.
+    - For an augmented crew, also include "augmented_pilots" (3 or 4) and "rest_facility" (1, 2 or 3).
+    - The Action Input must be valid JSON.
+    - Do not attempt to calculate duty legality yourself. Always call this tool and reason based on its output (which will provide projected arrival, duty end, flight duty period against its maximum, and legality for each crew member).
+        """
+
+def crew_on_duty_finder_instruction():
+    return """
+    When you use the `crew_on_duty_finder` tool:
+
+    - Call this tool when you need to know which crew based at an airport are on duty, or in rest, at a given time or during a time window.
+    - The Action Input must include:
+    • "airport": the crew base (e.g., "ORD").
+    • "time": a single time (YYYY-MM-DD HH:MM), or "start" and "end" for a window.
+    - Optionally include "state": "duty" (default) or "rest".
+    - The Action Input must be valid JSON.
+        """
+
+def check_crew_future_assignment_instruction():
+    return """
+    When you use the `check_crew_future_assignment` tool:
+
+    - Call this tool after `query_spare_pool` and before proposing a spare, to make sure the spare is not already committed to another flight during the duty they would cover.
+    - The Action Input must include:
+    • "crew_ids": a list of spare crew IDs to check.
+    • "start": when the spare would report (YYYY-MM-DD HH:MM).
+    • "end": the projected arrival of the flight they would cover (YYYY-MM-DD HH:MM).
+    - Optionally include "min_turn_minutes" for the required gap between assignments.
     - The Action Input must be valid JSON.
-    - Do not attempt to calculate duty legality yourself. Always call this tool and reason based on its output (which will provide projected arrival, duty end, and legality for each crew member).
+    - Do not propose a spare whose "conflict" is true.
         """
 
 def query_crew_roster_instruction():
@@ -181,11 +326,24 @@ def build_final_prompt(current_flight_data: str, report_buffer: int) -> str:
 
     Available tools:
     - query_crew_roster: Fetches crew assigned to a flight or details of a specific crew member. Expects Action Input as JSON with "flight_id" or "crew_id".
+    - delay_headroom_check: Checks in one step whether a delay keeps all crew on a flight legal.
     - duty_hour_checker: Checks crew duty legality.
+    - delay_propagation: Finds downstream flights and crew affected by a delay through crew pairings.
+    - crew_on_duty_finder: Finds crew based at an airport who are on duty or in rest at a given time.
     - query_spare_pool: Finds spare crew.
+    - check_crew_future_assignment: Checks spare crew for conflicts with their future assignments.
     - reposition_flight_finder: Finds repositioning flights.
+    - batch_reposition_finder: Finds repositioning options for many spare crew at once.
+    - plan_network_recovery: Plans spare crew for all delayed flights at once.
+    - book_reposition_seat: Books a seat on a repositioning flight.
+    - confirm_reservation: Confirms a tentative seat, hotel or transport hold.
+    - release_reservation: Cancels a seat, hotel or transport booking.
     - book_hotel: Books hotel accommodation.
+    - book_hotels_batch: Books hotel accommodation for the crew of many flights at one airport.
+    - hotel_night_availability: Shows rooms free on every night of a multi-night stay.
+    - book_hotel_nights: Books hotel rooms for a multi-night stay.
     - arrange_transport: Arranges ground transport.
+    - arrange_pooled_transport: Arranges shared ground transport for the crews of many flights.
     - policy_retriever: Retrieves relevant operational policy.
     - send_notification: Sends notifications.
     - add_affected_crew: Adds a crew member to the affected list.
@@ -200,12 +358,22 @@ def build_final_prompt(current_flight_data: str, report_buffer: int) -> str:
     - Provide Action Input as valid JSON.
     - Conclude with a final recommendation or escalation decision based on your reasoning.
 
+    {delay_headroom_check_instruction()}
     {query_crew_roster_instruction()}
     {duty_hour_checker_instruction()}
+    {delay_propagation_instruction()}
+    {crew_on_duty_finder_instruction()}
     {query_spare_pool_instruction()}
+    {check_crew_future_assignment_instruction()}
+    {plan_network_recovery_instruction()}
     {reposition_flight_finder_instruction()}
+    {batch_reposition_finder_instruction()}
+    {book_reposition_seat_instruction()}
     {book_hotel_instruction()}
+    {book_hotels_batch_instruction()}
+    {book_hotel_nights_instruction()}
     {arrange_transport_instruction()}
+    {arrange_pooled_transport_instruction()}
     {policy_retriever_instruction()}
     {send_notification_instruction()}
     {add_affected_crew_instruction()}
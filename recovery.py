@@ -0,0 +1,159 @@
+import numpy as np
+
+UNCOVERED_COST = 10_000.0
+INFEASIBLE_COST = 1e12
+REPOSITION_COST = 100.0
+REPOSITION_LEG_COST = 50.0
+ARRIVAL_SLACK_MINUTES = 60
+MAX_DUTY_MINUTES = 14 * 60
+
+
+def solve_assignment(cost):
+    """
+    Min-cost bipartite assignment (Hungarian algorithm with potentials) for a
+    rows x cols cost matrix with rows <= cols. The inner column scan is vectorized,
+    so a solve is O(rows^2) NumPy passes of length cols.
+
+    Returns:
+        np.ndarray: column assigned to each row
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    n_rows, n_cols = cost.shape
+    if n_rows > n_cols:
+        raise ValueError("solve_assignment needs at least as many columns as rows")
+
+    u = np.zeros(n_rows + 1)
+    v = np.zeros(n_cols + 1)
+    row_of_col = np.zeros(n_cols + 1, dtype=np.int64)
+    way = np.zeros(n_cols + 1, dtype=np.int64)
+
+    for row in range(1, n_rows + 1):
+        row_of_col[0] = row
+        col = 0
+        min_slack = np.full(n_cols + 1, np.inf)
+        used = np.zeros(n_cols + 1, dtype=bool)
+
+        while True:
+            used[col] = True
+            current_row = row_of_col[col]
+            slack = cost[current_row - 1] - u[current_row] - v[1:]
+
+            free = ~used[1:]
+            improved = free & (slack < min_slack[1:])
+            min_slack[1:][improved] = slack[improved]
+            way[1:][improved] = col
+
+            candidates = np.where(free, min_slack[1:], np.inf)
+            next_col = int(np.argmin(candidates)) + 1
+            delta = candidates[next_col - 1]
+
+            u[row_of_col[used]] += delta
+            v[used] -= delta
+            min_slack[~used] -= delta
+
+            col = next_col
+            if row_of_col[col] == 0:
+                break
+
+        while col:
+            previous = way[col]
+            row_of_col[col] = row_of_col[previous]
+            col = previous
+
+    assignment = np.full(n_rows, -1, dtype=np.int64)
+    matched = np.flatnonzero(row_of_col[1:])
+    assignment[row_of_col[1:][matched] - 1] = matched
+    return assignment
+
+
+def assign_spares(position_cost, uncovered_cost=UNCOVERED_COST):
+    """
+    Assigns spares to open positions at minimum total cost. position_cost is an
+    M positions x N spares matrix with INFEASIBLE_COST for pairs that cannot work.
+    Every position may instead stay uncovered at uncovered_cost, so the problem is
+    always solvable and an infeasible pair is never chosen.
+
+    Returns:
+        np.ndarray: spare column per position, -1 where the position stays uncovered
+    """
+    n_positions, n_spares = position_cost.shape
+    if n_positions == 0:
+        return np.array([], dtype=np.int64)
+
+    padded = np.hstack([
+        np.asarray(position_cost, dtype=np.float64),
+        np.full((n_positions, n_positions), uncovered_cost),
+    ])
+    assignment = solve_assignment(padded)
+    assignment[assignment >= n_spares] = -1
+    return assignment
+
+
+def feasibility_matrix(spare, position, reposition, max_duty_minutes=MAX_DUTY_MINUTES):
+    """
+    Spare x position feasibility and cost for N spares and M open positions, built
+    with broadcasting over small integer codes and no Python loops. Role, aircraft
+    and airport values must be encoded with shared codes on both sides (airport
+    codes index the reposition tables).
+
+    Args:
+        spare (dict): length-N arrays: role_code, aircraft_code, base_code, ready (datetime64[m])
+        position (dict): length-M arrays: role_code, aircraft_code, airport_code, group,
+            report_time and projected_arrival (datetime64[m])
+        reposition (dict): G position groups x B airport codes int64 arrays from the
+            reverse connection scan: latest_departure, arrival (epoch minutes,
+            int64 min where unreachable) and legs
+        max_duty_minutes (int): longest duty a spare may start, from reposition
+            departure (or report time when already at the airport) to projected arrival
+
+    Returns:
+        (np.ndarray, np.ndarray, np.ndarray): N x M feasible (bool), cost (float64,
+        INFEASIBLE_COST where not feasible), duty_remaining (int32 minutes, only set
+        where feasible)
+    """
+    unreachable = np.iinfo(np.int64).min
+    n_spares, n_positions = len(spare["role_code"]), len(position["role_code"])
+
+    # qualification first: one small-int comparison over the full N x M grid, then
+    # the time and reposition terms only for the (usually few) qualified pairs
+    aircraft_span = int(max(spare["aircraft_code"].max(initial=0), position["aircraft_code"].max(initial=0))) + 1
+    spare_key = spare["role_code"].astype(np.int32) * aircraft_span + spare["aircraft_code"]
+    position_key = position["role_code"].astype(np.int32) * aircraft_span + position["aircraft_code"]
+    spare_index, position_index = np.nonzero(spare_key[:, None] == position_key[None, :])
+
+    ready = np.where(np.isnat(spare["ready"]), unreachable, spare["ready"].astype(np.int64))[spare_index]
+    report_time = position["report_time"].astype(np.int64)[position_index]
+    projected_arrival = position["projected_arrival"].astype(np.int64)[position_index]
+    base_code = spare["base_code"][spare_index]
+    same_base = base_code == position["airport_code"][position_index]
+
+    group = position["group"][position_index]
+    latest_departure = reposition["latest_departure"][group, base_code]
+    arrival = reposition["arrival"][group, base_code]
+    legs = reposition["legs"][group, base_code]
+    no_route = latest_departure == unreachable
+    # a spare without rest_until is ready at int64 min too, so no_route must be excluded explicitly
+    repositionable = ~no_route & (latest_departure >= ready)
+
+    duty_start = np.where(same_base | no_route, report_time, latest_departure)
+    pair_duty_remaining = max_duty_minutes - (projected_arrival - duty_start)
+
+    pair_feasible = (ready <= report_time) & (same_base | repositionable) & (pair_duty_remaining >= 0)
+
+    # deadheading costs a fixed amount plus per extra leg; tight arrivals cost more
+    slack = np.where(same_base | no_route, ARRIVAL_SLACK_MINUTES, report_time - arrival)
+    pair_cost = (
+        np.where(same_base, 0.0, REPOSITION_COST + REPOSITION_LEG_COST * np.maximum(legs - 1, 0))
+        + np.maximum(ARRIVAL_SLACK_MINUTES - slack, 0)
+    )
+
+    feasible = np.zeros((n_spares, n_positions), dtype=bool)
+    cost = np.full((n_spares, n_positions), INFEASIBLE_COST)
+    duty_remaining = np.full((n_spares, n_positions), np.iinfo(np.int32).min, dtype=np.int32)
+
+    spare_index, position_index = spare_index[pair_feasible], position_index[pair_feasible]
+    feasible[spare_index, position_index] = True
+    cost[spare_index, position_index] = pair_cost[pair_feasible]
+    duty_remaining[spare_index, position_index] = pair_duty_remaining[pair_feasible]
+
+    return feasible, cost, duty_remaining
@@ -0,0 +1,358 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class _CapacityTree():
+    """
+    Max segment tree over one kind's providers at an airport, leaves in preference
+    order. Changing a provider's remaining units and finding the first provider (in
+    preference order) with at least N units left are both O(log n).
+    """
+
+    def __init__(self, capacities=()):
+        self._build(list(capacities))
+
+    def _build(self, capacities):
+        self.size = 1
+        while self.size < len(capacities):
+            self.size *= 2
+        self.tree = [0] * (2 * self.size)
+        self.tree[self.size:self.size + len(capacities)] = capacities
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def set(self, rank, remaining):
+        if rank >= self.size:
+            self._build(self.tree[self.size:] + [0] * (rank + 1 - self.size))
+        node = rank + self.size
+        self.tree[node] = remaining
+        while node > 1:
+            node >>= 1
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def first_at_least(self, quantity):
+        """
+        Rank of the first provider with at least quantity units left, or -1.
+        """
+        if self.tree[1] < quantity:
+            return -1
+        node = 1
+        while node < self.size:
+            node = 2 * node if self.tree[2 * node] >= quantity else 2 * node + 1
+        return node - self.size
+
+
+class ReservationEngine():
+    """
+    In-process inventory for hotel rooms, ground transport seats and reposition
+    flight seats. Inventory is partitioned per airport and every partition is
+    guarded by one of a fixed set of striped locks, so concurrent disruption
+    workers at different airports never contend on a single global lock.
+
+    Every allocation is a hold that is later confirmed or released:
+        hold -> confirm   (inventory stays taken)
+        hold -> release   (inventory goes back)
+        hold -> expire    (tentative hold outlived its ttl, inventory goes back)
+        confirm -> release (cancellation, inventory goes back)
+
+    Tentative holds are expired from a per-partition min-heap keyed by expiry
+    time, so expiring is O(log n) per hold instead of a scan over all holds.
+    on_expire, if given, is called with each expired hold record.
+
+    Each partition also keeps, per kind, a max tree of remaining capacity over its
+    providers in preference order, updated on every take and return, so finding
+    the first preferred provider that can take a request is O(log n), not a scan.
+    """
+
+    def __init__(self, stripes=16, clock=time.monotonic, on_expire=None):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._partitions = dict()
+        self._hold_airports = dict()
+        self._hold_counter = itertools.count(1)
+        self._clock = clock
+        self._on_expire = on_expire
+
+    def _lock_for(self, airport):
+        return self._locks[hash(airport) % len(self._locks)]
+
+    def _partition(self, airport):
+        # dict.setdefault is atomic, so two workers creating the same partition agree
+        return self._partitions.setdefault(
+            airport, {
+                "inventory": dict(),
+                "holds": dict(),
+                "expiry_heap": list(),
+                "order": dict(),
+                "rank": dict(),
+                "capacity_index": dict(),
+            }
+        )
+
+    def _set_remaining(self, partition, kind, name, remaining):
+        """
+        Changes one provider's remaining units and updates the capacity index.
+        Must be called with the partition's lock held.
+        """
+        tree = partition["capacity_index"].setdefault(kind, _CapacityTree())
+        tree.set(partition["rank"][(kind, name)], remaining)
+        partition["inventory"][(kind, name)] = remaining
+
+    def _first_fit(self, partition, kind, quantity):
+        """
+        First provider in preference order with at least quantity units left, or None.
+        """
+        tree = partition["capacity_index"].get(kind)
+        order = partition["order"].get(kind, [])
+        rank = -1 if tree is None else tree.first_at_least(quantity)
+        return order[rank] if 0 <= rank < len(order) else None
+
+    def _expire_locked(self, partition):
+        """
+        Pops every due entry off the partition's expiry heap. Entries for holds that
+        were confirmed or released meanwhile are stale and simply dropped.
+        Must be called with the partition's lock held.
+        """
+        now = self._clock()
+        heap = partition["expiry_heap"]
+        expired = []
+        while heap and heap[0][0] <= now:
+            _, hold_id = heapq.heappop(heap)
+            hold = partition["holds"].get(hold_id)
+            if hold is None or hold["state"] != "held":
+                continue
+            del partition["holds"][hold_id]
+            key = (hold["kind"], hold["name"])
+            self._set_remaining(partition, hold["kind"], hold["name"], partition["inventory"][key] + hold["quantity"])
+            self._hold_airports.pop(hold_id, None)
+            hold["state"] = "expired"
+            expired.append(hold)
+        return expired
+
+    def _notify_expired(self, expired):
+        if self._on_expire is not None:
+            for hold in expired:
+                self._on_expire(hold)
+
+    def expire(self):
+        """
+        Expires due tentative holds in every partition; returns the expired hold records.
+        Operations on a partition also expire its due holds, so calling this is only
+        needed to return inventory from partitions nobody is touching.
+        """
+        expired = []
+        for airport, partition in list(self._partitions.items()):
+            with self._lock_for(airport):
+                expired.extend(self._expire_locked(partition))
+        self._notify_expired(expired)
+        return expired
+
+    def add_inventory(self, kind, airport, name, quantity):
+        """
+        Registers (or tops up) a provider, e.g. add_inventory("hotel", "ORD", "Airport Inn", 2).
+        Registration order is the preference order unless set_preference overrides it.
+        """
+        partition = self._partition(airport)
+        with self._lock_for(airport):
+            key = (kind, name)
+            if key not in partition["rank"]:
+                order = partition["order"].setdefault(kind, [])
+                partition["rank"][key] = len(order)
+                order.append(name)
+            self._set_remaining(partition, kind, name, partition["inventory"].get(key, 0) + int(quantity))
+
+    def set_preference(self, kind, airport, names):
+        """
+        Precomputed provider order for kind at airport, most preferred first.
+        Providers left out keep their registration order after the listed ones.
+        """
+        partition = self._partition(airport)
+        with self._lock_for(airport):
+            registered = partition["order"].get(kind, [])
+            known = set(registered)
+            preferred = [name for name in dict.fromkeys(names) if name in known]
+            listed = set(preferred)
+            order = preferred + [name for name in registered if name not in listed]
+
+            partition["order"][kind] = order
+            for rank, name in enumerate(order):
+                partition["rank"][(kind, name)] = rank
+            partition["capacity_index"][kind] = _CapacityTree(
+                [partition["inventory"][(kind, name)] for name in order]
+            )
+
+    def providers(self, kind, airport):
+        """
+        Names of the providers of kind at airport, in preference order.
+        """
+        partition = self._partitions.get(airport)
+        if partition is None:
+            return []
+        with self._lock_for(airport):
+            return list(partition["order"].get(kind, []))
+
+    def load_dataframe(self, kind, df, airport_column, name_column, quantity_column):
+        """
+        Registers every row of an inventory dataframe (hotels_df, transport_df, ...).
+        """
+        if df is None:
+            return
+        for airport, name, quantity in zip(df[airport_column], df[name_column], df[quantity_column]):
+            self.add_inventory(kind, airport, name, quantity)
+
+    def available(self, kind, airport, name):
+        partition = self._partitions.get(airport)
+        if partition is None:
+            return 0
+        with self._lock_for(airport):
+            expired = self._expire_locked(partition)
+            remaining = partition["inventory"].get((kind, name), 0)
+        self._notify_expired(expired)
+        return remaining
+
+    def _take(self, partition, airport, kind, name, quantity, owner, ttl_seconds):
+        self._set_remaining(partition, kind, name, partition["inventory"][(kind, name)] - quantity)
+        hold_id = f"{airport}-{next(self._hold_counter)}"
+        hold = {
+            "hold_id": hold_id,
+            "kind": kind,
+            "airport": airport,
+            "name": name,
+            "quantity": quantity,
+            "owner": owner,
+            "state": "held",
+            "ttl_seconds": ttl_seconds,
+            "expires_at": None,
+        }
+        if ttl_seconds is not None:
+            hold["expires_at"] = self._clock() + ttl_seconds
+            heapq.heappush(partition["expiry_heap"], (hold["expires_at"], hold_id))
+        partition["holds"][hold_id] = hold
+        self._hold_airports[hold_id] = airport
+        return dict(hold)
+
+    def hold(self, kind, airport, name, quantity, owner=None, ttl_seconds=None):
+        """
+        Atomically takes quantity units from one provider. With ttl_seconds the hold
+        is tentative and returns to inventory unless confirmed in time.
+
+        Returns:
+            dict: the hold record, or None if the provider lacks capacity
+        """
+        partition = self._partition(airport)
+        with self._lock_for(airport):
+            expired = self._expire_locked(partition)
+            booking = None
+            if partition["inventory"].get((kind, name), 0) >= quantity:
+                booking = self._take(partition, airport, kind, name, quantity, owner, ttl_seconds)
+        self._notify_expired(expired)
+        return booking
+
+    def hold_any(self, kind, airport, quantity, owner=None, ttl_seconds=None):
+        """
+        Atomically takes quantity units from the first provider of this kind at
+        airport, in preference order, that can cover all of them. O(log n) in the
+        providers.
+
+        Returns:
+            dict: the hold record, or None if no single provider has capacity
+        """
+        partition = self._partition(airport)
+        with self._lock_for(airport):
+            expired = self._expire_locked(partition)
+            booking = None
+            name = self._first_fit(partition, kind, quantity)
+            if name is not None:
+                booking = self._take(partition, airport, kind, name, quantity, owner, ttl_seconds)
+        self._notify_expired(expired)
+        return booking
+
+    def hold_split(self, kind, airport, quantities, owners=None, ttl_seconds=None):
+        """
+        Allocates many requests at one airport in a single pass under one lock, in
+        request order. A request goes to the first provider that can take all of it
+        (see hold_any); otherwise it is split across providers in preference order.
+        A request that the airport's remaining capacity cannot cover takes nothing.
+
+        Returns:
+            list: per request, the list of hold records it was split into, or None
+        """
+        owners = owners if owners is not None else [None] * len(quantities)
+        partition = self._partition(airport)
+        with self._lock_for(airport):
+            expired = self._expire_locked(partition)
+            inventory = partition["inventory"]
+            providers = partition["order"].get(kind, [])
+            remaining = sum(inventory[(kind, name)] for name in providers)
+
+            allocations = []
+            for quantity, owner in zip(quantities, owners):
+                if quantity <= 0 or quantity > remaining:
+                    allocations.append(None)
+                    continue
+
+                single = self._first_fit(partition, kind, quantity)
+                if single is not None:
+                    chunks = [(single, quantity)]
+                else:
+                    chunks, needed = [], quantity
+                    for name in providers:
+                        take = min(inventory[(kind, name)], needed)
+                        if take > 0:
+                            chunks.append((name, take))
+                            needed -= take
+                        if needed == 0:
+                            break
+
+                allocations.append([
+                    self._take(partition, airport, kind, name, take, owner, ttl_seconds) for name, take in chunks
+                ])
+                remaining -= quantity
+        self._notify_expired(expired)
+        return allocations
+
+    def get_hold(self, hold_id):
+        airport = self._hold_airports.get(hold_id)
+        if airport is None:
+            return None
+        hold = self._partitions[airport]["holds"].get(hold_id)
+        return None if hold is None else dict(hold)
+
+    def confirm(self, hold_id):
+        """
+        Turns a hold into a confirmed booking. Returns the hold record, or None if
+        the hold does not exist (never placed, already released or expired).
+        """
+        airport = self._hold_airports.get(hold_id)
+        if airport is None:
+            return None
+        partition = self._partitions[airport]
+        with self._lock_for(airport):
+            expired = self._expire_locked(partition)
+            hold = partition["holds"].get(hold_id)
+            if hold is not None:
+                hold["state"] = "confirmed"
+                hold["expires_at"] = None
+                hold = dict(hold)
+        self._notify_expired(expired)
+        return hold
+
+    def release(self, hold_id):
+        """
+        Returns a held or confirmed allocation to inventory. Returns the released
+        hold record, or None if there was nothing to release.
+        """
+        airport = self._hold_airports.get(hold_id)
+        if airport is None:
+            return None
+        partition = self._partitions[airport]
+        with self._lock_for(airport):
+            hold = partition["holds"].pop(hold_id, None)
+            if hold is None:
+                return None
+            key = (hold["kind"], hold["name"])
+            self._set_remaining(partition, hold["kind"], hold["name"], partition["inventory"][key] + hold["quantity"])
+        self._hold_airports.pop(hold_id, None)
+        hold["state"] = "released"
+        return hold
@@ -0,0 +1,174 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from time_utils import format_time_column, normalize_time_columns, parse_time
+
+CATEGORICAL_COLUMNS = ["role", "base", "qualified_aircraft", "status", "assigned_flight_id"]
+
+
+def _code_dtype(n_categories):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _is_missing(value):
+    return value is None or (not isinstance(value, str) and pd.isna(value))
+
+
+class RosterStore():
+    """
+    Columnar crew roster and the tools' only copy of it. Crew ids map to integer
+    row ids, text columns become small-int category codes (-1 where missing), time
+    columns datetime64[m] and numeric columns plain NumPy arrays, so every roster
+    filter is a comparison over int8/int16 arrays instead of Python object strings.
+
+    Rows are decoded back into dicts (times as "%Y-%m-%d %H:%M" strings) only when
+    a tool builds its output, through record / records.
+    """
+
+    def __init__(self, crew_roster_df, time_columns):
+        self.row_of = dict()
+        self.columns = []
+        self.categories = dict()
+        self.category_codes = dict()
+        self.codes = dict()
+        self.numbers = dict()
+        self.times = normalize_time_columns(crew_roster_df, time_columns)
+
+        if crew_roster_df is None:
+            self.crew_ids = np.array([], dtype=object)
+            for column in CATEGORICAL_COLUMNS:
+                self._set_categories(column, np.array([], dtype=np.int8), [])
+            return
+
+        self.columns = list(crew_roster_df.columns)
+        self.crew_ids = crew_roster_df["crew_id"].to_numpy(dtype=object)
+        self.row_of = {crew_id: row for row, crew_id in enumerate(self.crew_ids)}
+        for column in self.columns:
+            if column == "crew_id" or column in self.times:
+                continue
+            values = crew_roster_df[column]
+            if pd.api.types.is_numeric_dtype(values) and column not in CATEGORICAL_COLUMNS:
+                self.numbers[column] = values.to_numpy()
+                continue
+            codes, categories = pd.factorize(values)
+            categories = list(categories)
+            self._set_categories(column, codes.astype(_code_dtype(len(categories))), categories)
+
+        for column in CATEGORICAL_COLUMNS:
+            if column not in self.codes:
+                self._set_categories(column, np.full(len(self.crew_ids), -1, dtype=np.int8), [])
+
+    def __len__(self):
+        return len(self.crew_ids)
+
+    def _set_categories(self, column, codes, categories):
+        self.codes[column] = codes
+        self.categories[column] = categories
+        self.category_codes[column] = {value: code for code, value in enumerate(categories)}
+
+    def code(self, column, value):
+        """
+        Category code of one value, -1 if the value never occurs in column.
+        """
+        return self.category_codes[column].get(value, -1)
+
+    def encode(self, column, values):
+        """
+        Category codes for an array of outside values (e.g. flight_schedule_df aircraft
+        types against qualified_aircraft), -1 where a value is not a known category.
+        """
+        return pd.Index(self.categories[column], dtype=object).get_indexer(np.asarray(values, dtype=object))
+
+    def value(self, column, row):
+        """
+        Decoded value of one cell; None where missing.
+        """
+        return self.values(column, [row])[0]
+
+    def values(self, column, rows):
+        """
+        Decoded values of column for rows; None where missing, times as strings.
+        """
+        if column == "crew_id":
+            return self.crew_ids[rows]
+        if column in self.times:
+            return np.array(format_time_column(self.times[column][rows]), dtype=object)
+        if column in self.numbers:
+            return np.asarray(self.numbers[column][rows], dtype=object)
+        lookup = np.array(self.categories[column] + [None], dtype=object)
+        return lookup[self.codes[column][rows]]
+
+    def records(self, rows, columns=None):
+        """
+        Roster rows as dicts in roster column order (or the given columns), for tool output.
+        """
+        columns = self.columns if columns is None else columns
+        decoded = [self.values(column, rows).tolist() for column in columns]
+        return [dict(zip(columns, values)) for values in zip(*decoded)]
+
+    def record(self, row, columns=None):
+        return self.records([row], columns)[0]
+
+    def mask(self, **equals):
+        """
+        Rows where every given column equals the given value, e.g.
+        mask(role="captain", qualified_aircraft="B737", status="active"). A value that
+        never occurs matches no row, not the rows where the column is missing.
+        """
+        selected = np.ones(len(self), dtype=bool)
+        for column, value in equals.items():
+            code = self.code(column, value)
+            if code < 0:
+                return np.zeros(len(self), dtype=bool)
+            selected &= self.codes[column] == code
+        return selected
+
+    def missing(self, column):
+        return self.codes[column] < 0
+
+    def set_value(self, row, column, value):
+        """
+        Updates one cell. A column the roster did not have is added as a text column.
+        """
+        if column == "crew_id":
+            raise ValueError("crew_id cannot be changed")
+        if column in self.times:
+            self.times[column][row] = parse_time(value)
+            return
+        if column in self.numbers:
+            self.numbers[column][row] = np.nan if _is_missing(value) else value
+            return
+        if column not in self.codes:
+            self._set_categories(column, np.full(len(self), -1, dtype=np.int8), [])
+        if column not in self.columns:
+            self.columns.append(column)
+
+        if _is_missing(value):
+            self.codes[column][row] = -1
+            return
+
+        code = self.category_codes[column].get(value)
+        if code is None:
+            code = len(self.categories[column])
+            self.categories[column].append(value)
+            self.category_codes[column][value] = code
+            if code >= np.iinfo(self.codes[column].dtype).max:
+                self.codes[column] = self.codes[column].astype(_code_dtype(code + 1))
+        self.codes[column][row] = code
+
+    def memory_bytes(self):
+        """
+        Bytes held by the store, counting category values and crew id strings.
+        """
+        return (
+            sum(codes.nbytes for codes in self.codes.values())
+            + sum(times.nbytes for times in self.times.values())
+            + sum(numbers.nbytes for numbers in self.numbers.values())
+            + sum(sys.getsizeof(value) for categories in self.categories.values() for value in categories)
+            + self.crew_ids.nbytes + sum(sys.getsizeof(crew_id) for crew_id in self.crew_ids)
+        )
@@ -0,0 +1,222 @@
+import numpy as np
+
+
+class RepositionIndex():
+    """
+    Read-only view of the reposition flight table bucketed by (origin, destination).
+    Each bucket holds row positions sorted by arrival time, so "earliest" or
+    "latest flight arriving by a deadline" is a bisect instead of a filter and sort.
+    Seat availability is kept in its own array, never written back to the dataframe.
+    """
+
+    def __init__(self, reposition_flight_df, sched_dep, sched_arr):
+        self.flight_df = reposition_flight_df
+        self.sched_dep = sched_dep
+        self.sched_arr = sched_arr
+        self.routes = dict()
+        self.flight_position = dict()
+
+        if reposition_flight_df is None or reposition_flight_df.empty:
+            self.seats = np.array([], dtype=np.int64)
+            return
+
+        self.seats = reposition_flight_df["seats_available"].to_numpy().astype(np.int64)
+
+        for position, flight_id in enumerate(reposition_flight_df["flight_id"]):
+            self.flight_position[flight_id] = position
+
+        origin = reposition_flight_df["origin"].to_numpy()
+        destination = reposition_flight_df["destination"].to_numpy()
+        order = np.lexsort((sched_arr, destination, origin))
+        route_keys = list(zip(origin[order], destination[order]))
+
+        start = 0
+        for end in range(1, len(order) + 1):
+            if end == len(order) or route_keys[end] != route_keys[start]:
+                positions = order[start:end]
+                self.routes[route_keys[start]] = {
+                    "positions": positions,
+                    "sched_arr": sched_arr[positions],
+                }
+                start = end
+
+    def set_seats(self, flight_id, seats):
+        """
+        Records the remaining seat count for one reposition flight.
+        """
+        position = self.flight_position.get(flight_id)
+        if position is not None:
+            self.seats[position] = seats
+
+    def seats_for(self, flight_id):
+        position = self.flight_position.get(flight_id)
+        return 0 if position is None else int(self.seats[position])
+
+    def arriving_by(self, origin, destination, deadline, earliest_departure=None):
+        """
+        Row positions of flights origin -> destination with a free seat that arrive
+        at or before deadline (and leave at or after earliest_departure), in arrival order.
+        """
+        route = self.routes.get((origin, destination))
+        if route is None:
+            return np.array([], dtype=np.int64)
+
+        cutoff = np.searchsorted(route["sched_arr"], deadline, side="right")
+        positions = route["positions"][:cutoff]
+        usable = self.seats[positions] > 0
+        if earliest_departure is not None and not np.isnat(earliest_departure):
+            usable &= self.sched_dep[positions] >= earliest_departure
+
+        return positions[usable]
+
+
+class ConnectionScanRouter():
+    """
+    Time-dependent earliest-arrival routing over the reposition flight table using
+    the Connection Scan Algorithm: every flight is a connection, sorted once by
+    departure, and a query is a single forward scan that stops as soon as no later
+    departure can improve the arrival at the target.
+    """
+
+    def __init__(self, reposition_index):
+        self.index = reposition_index
+        df = reposition_index.flight_df
+
+        self.stop_codes = dict()
+        if df is None or df.empty:
+            self.positions = []
+            return
+
+        dep = reposition_index.sched_dep
+        arr = reposition_index.sched_arr
+        valid = np.flatnonzero(~np.isnat(dep) & ~np.isnat(arr))
+        order = valid[np.argsort(dep[valid], kind="stable")]
+
+        for airport in list(df["origin"]) + list(df["destination"]):
+            self.stop_codes.setdefault(airport, len(self.stop_codes))
+
+        origin = df["origin"].to_numpy()
+        destination = df["destination"].to_numpy()
+
+        # plain lists keep the per-connection scan loop cheap
+        self.positions = order.tolist()
+        self.dep_stop = [self.stop_codes[airport] for airport in origin[order]]
+        self.arr_stop = [self.stop_codes[airport] for airport in destination[order]]
+        self.dep_minutes = dep[order].astype(np.int64).tolist()
+        self.arr_minutes = arr[order].astype(np.int64).tolist()
+        self.dep_sorted = dep[order].astype(np.int64)
+
+        # the same connections ordered by arrival, latest first, for reverse scans
+        by_arrival = np.argsort(arr[order], kind="stable")[::-1]
+        self.arr_desc = by_arrival.tolist()
+
+    def earliest_arrival(self, origin, destination, deadline, earliest_departure=None, min_connection_minutes=45):
+        """
+        Earliest-arrival itinerary from origin to destination that arrives by deadline.
+        Connections at intermediate airports must leave at least min_connection_minutes
+        after the previous leg lands; flights without a free seat are skipped.
+
+        Returns:
+            list of reposition_flight_df row positions (legs in order), or None
+        """
+        source = self.stop_codes.get(origin)
+        target = self.stop_codes.get(destination)
+        if source is None or target is None or source == target:
+            return None
+
+        unreachable = np.iinfo(np.int64).max
+        deadline = int(np.datetime64(deadline, "m").astype(np.int64))
+        if earliest_departure is None or np.isnat(earliest_departure):
+            start_time = -unreachable
+        else:
+            start_time = int(np.datetime64(earliest_departure, "m").astype(np.int64))
+
+        arrival = [unreachable] * len(self.stop_codes)
+        ready = [unreachable] * len(self.stop_codes)
+        via = [-1] * len(self.stop_codes)
+        arrival[source] = start_time
+        ready[source] = start_time
+
+        seats = self.index.seats
+        start = int(np.searchsorted(self.dep_sorted, start_time, side="left"))
+        for i in range(start, len(self.positions)):
+            departure = self.dep_minutes[i]
+            if departure > deadline or departure >= arrival[target]:
+                break
+            if ready[self.dep_stop[i]] > departure or seats[self.positions[i]] <= 0:
+                continue
+
+            stop = self.arr_stop[i]
+            if self.arr_minutes[i] < arrival[stop]:
+                arrival[stop] = self.arr_minutes[i]
+                ready[stop] = self.arr_minutes[i] + min_connection_minutes
+                via[stop] = i
+
+        if arrival[target] > deadline:
+            return None
+
+        legs = []
+        stop = target
+        while stop != source:
+            connection = via[stop]
+            legs.append(self.positions[connection])
+            stop = self.dep_stop[connection]
+        legs.reverse()
+
+        return legs
+
+    def latest_departures(self, destination, deadline, min_connection_minutes=45, not_before=None):
+        """
+        Many-to-one reverse connection scan. One pass over connections in decreasing
+        arrival order gives, for every airport, the latest departure that still reaches
+        destination by deadline, and the first leg of that itinerary.
+        Connections arriving before not_before are never needed and end the scan.
+
+        Returns:
+            dict: { airport: { "departure": epoch minutes, "legs": [row positions] } }
+            for every airport that can reach destination in time
+        """
+        target = self.stop_codes.get(destination)
+        if target is None:
+            return dict()
+
+        unreachable = np.iinfo(np.int64).min
+        deadline = int(np.datetime64(deadline, "m").astype(np.int64))
+        floor = unreachable
+        if not_before is not None and not np.isnat(not_before):
+            floor = int(np.datetime64(not_before, "m").astype(np.int64))
+
+        latest = [unreachable] * len(self.stop_codes)
+        next_connection = [-1] * len(self.stop_codes)
+        latest[target] = deadline
+
+        seats = self.index.seats
+        for i in self.arr_desc:
+            arrival = self.arr_minutes[i]
+            if arrival < floor:
+                break
+
+            stop = self.arr_stop[i]
+            needed_by = latest[stop] if stop == target else latest[stop] - min_connection_minutes
+            if latest[stop] == unreachable or arrival > needed_by or seats[self.positions[i]] <= 0:
+                continue
+
+            origin = self.dep_stop[i]
+            if origin != target and self.dep_minutes[i] > latest[origin]:
+                latest[origin] = self.dep_minutes[i]
+                next_connection[origin] = i
+
+        airports = {code: airport for airport, code in self.stop_codes.items()}
+        result = dict()
+        for code, departure in enumerate(latest):
+            if code == target or departure == unreachable:
+                continue
+            legs = []
+            stop = code
+            while stop != target:
+                connection = next_connection[stop]
+                legs.append(self.positions[connection])
+                stop = self.arr_stop[connection]
+            result[airports[code]] = {"departure": departure, "legs": legs}
+
+        return result
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+TIME_FORMAT = "%Y-%m-%d %H:%M"
+TIME_DTYPE = "datetime64[m]"
+
+
+def parse_time(value):
+    """
+    Parses one "%Y-%m-%d %H:%M" string (or datetime) into a minute-resolution
+    numpy datetime64. Missing values become NaT.
+    """
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return np.datetime64("NaT", "m")
+    if isinstance(value, str):
+        value = pd.to_datetime(value, format=TIME_FORMAT)
+    return np.datetime64(value, "m")
+
+
+def epoch_minutes(value):
+    """
+    Minutes since the epoch as a plain int for one time parse_time accepts, for
+    bisect-based structures that keep times in Python lists.
+    """
+    return int(parse_time(value).astype(np.int64))
+
+
+def parse_time_column(values):
+    """
+    Parses a column of "%Y-%m-%d %H:%M" strings into a datetime64[m] array.
+    """
+    return (
+        pd.to_datetime(pd.Series(values, dtype=object), format=TIME_FORMAT)
+        .to_numpy()
+        .astype(TIME_DTYPE)
+    )
+
+
+def format_time(value):
+    """
+    Formats a datetime64 back into the "%Y-%m-%d %H:%M" string used in tool outputs.
+    """
+    if np.isnat(value):
+        return None
+    return pd.Timestamp(value).strftime(TIME_FORMAT)
+
+
+def format_time_column(values):
+    """
+    Vectorized format_time; NaT entries become None.
+    """
+    values = np.asarray(values, dtype=TIME_DTYPE)
+    formatted = pd.DatetimeIndex(values).strftime(TIME_FORMAT)
+    return [None if missing else text for text, missing in zip(formatted, np.isnat(values))]
+
+
+def normalize_time_columns(df, columns):
+    """
+    Load-time normalization stage: parses every listed time column of df into
+    a datetime64[m] array exactly once.
+
+    Returns:
+        dict: { column_name: np.ndarray[datetime64[m]] } for the columns present in df
+    """
+    if df is None:
+        return {column: np.array([], dtype=TIME_DTYPE) for column in columns}
+
+    return {
+        column: parse_time_column(df[column]) if column in df.columns
+        else np.full(len(df), np.datetime64("NaT"), dtype=TIME_DTYPE)
+        for column in columns
+    }
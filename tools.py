@@ -1,7 +1,26 @@
 import json
-from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 from langchain.agents import initialize_agent, Tool, AgentType
+from assignment_timeline import TIME_BITS, AssignmentTimeline
+from delay_propagation import PairingGraph
+from fdp_rules import DEFAULT_FDP_RULES, compiled_fdp_limits
+from hotel_calendar import RoomNightCalendar
+from interval_index import IntervalTree
+from policy_index import PolicyIndex
+from recovery import INFEASIBLE_COST, assign_spares, feasibility_matrix
+from reservations import ReservationEngine
+from roster_store import RosterStore
+from routing import ConnectionScanRouter, RepositionIndex
+from transport_pooling import POOL_WINDOW_MINUTES, pack_vehicles, pool_requests
+from time_utils import parse_time, format_time, format_time_column, normalize_time_columns
+
+CREW_TIME_COLUMNS = ["duty_start", "duty_end", "rest_until"]
+FLIGHT_TIME_COLUMNS = ["sched_dep", "sched_arr"]
+MIN_CONNECTION_MINUTES = 45
+MAX_REPOSITION_OPTIONS = 3
+MIN_TURN_MINUTES = 30
+HOTEL_CALENDAR_DAYS = 30
 
 class StatusQueryTools():
     def __init__(
@@ -12,16 +31,45 @@ class StatusQueryTools():
             hotels_df,
             transport_df,
             policies_df,
+            crew_assignments_df=None,
         ):
 
-        self.crew_roster_df = crew_roster_df
         self.reposition_flight_df = repositioning_flights_df
         self.flight_schedule_df = flight_schedule_df
         self.hotels_df = hotels_df
         self.transport_df = transport_df
         self.policies_df = policies_df
+        self.crew_assignments_df = crew_assignments_df
         self.affected_crew_list = list()
 
+        self._normalize_time_fields(crew_roster_df)
+        self._build_crew_indexes()
+        self._build_pairings()
+        self.fdp_limits = compiled_fdp_limits(DEFAULT_FDP_RULES)
+        self._build_delay_headroom()
+        self.policy_index = PolicyIndex(policies_df)
+        self.reposition_index = RepositionIndex(
+            self.reposition_flight_df,
+            self.reposition_times["sched_dep"],
+            self.reposition_times["sched_arr"],
+        )
+        self.reposition_router = ConnectionScanRouter(self.reposition_index)
+
+        self.reservations = ReservationEngine(on_expire=self._on_reservation_expired)
+        self.reservations.load_dataframe("hotel", hotels_df, "airport", "hotel_name", "rooms_available")
+        self._build_hotel_preferences()
+        # the engine above holds the rooms of the first night (the one book_hotel books);
+        # the calendar holds only the nights after it, so no night is counted twice
+        self.hotel_first_night = self._calendar_start()
+        self.hotel_calendar = RoomNightCalendar(
+            hotels_df, self.hotel_first_night + np.timedelta64(1, "D"), HOTEL_CALENDAR_DAYS - 1
+        )
+        self.hotel_stays = dict()
+        self.reservations.load_dataframe("transport", transport_df, "airport", "service_name", "seats_available")
+        self.reservations.load_dataframe(
+            "reposition_seat", repositioning_flights_df, "origin", "flight_id", "seats_available"
+        )
+
         self.tools = [
             Tool(
                 name="query_crew_roster",
@@ -31,32 +79,97 @@ class StatusQueryTools():
             Tool(
                 name="duty_hour_checker",
                 func=self.duty_hour_checker,
-                description="Checks duty legality for provided crew. Expects JSON input with crew_ids, sched_arr, delay_minutes."
+                description="Checks duty legality (duty_end and maximum flight duty period) for provided crew. Expects JSON input with crew_ids, sched_arr, delay_minutes and optional augmented_pilots, rest_facility."
+            ),
+            Tool(
+                name="delay_headroom_check",
+                func=self.delay_headroom_check,
+                description="Checks in one step whether a delay stays within the duty headroom of all crew on a flight. Expects JSON input with flight_id and delay_minutes."
+            ),
+            Tool(
+                name="delay_propagation",
+                func=self.delay_propagation,
+                description="Finds downstream flights and crew affected when a delay propagates through crew pairings. Expects JSON input with flight_id and delay_minutes."
+            ),
+            Tool(
+                name="crew_on_duty_finder",
+                func=self.crew_on_duty_finder,
+                description="Finds crew based at an airport who are on duty (or in rest) at a time or during a time window. Expects JSON input with airport, time or start and end, and optional state (duty or rest)."
             ),
             Tool(
                 name="query_spare_pool",
                 func=self.query_spare_pool,
-                description="Finds spare crew for a required role and aircraft type. Expects JSON input with required_role, qualified_aircraft, exclude_crew_ids."
+                description="Finds spare crew for a required role and aircraft type. Expects JSON input with required_role, qualified_aircraft, exclude_crew_ids; add top_k, departure_airport, sched_dep, delay_minutes, report_buffer to get only the best ranked spares."
+            ),
+            Tool(
+                name="check_crew_future_assignment",
+                func=self.check_crew_future_assignment,
+                description="Checks spare crew for conflicts with their future assignments. Expects JSON input with crew_ids, start, end and optional min_turn_minutes."
             ),
             Tool(
                 name="reposition_flight_finder",
                 func=self.reposition_flight_finder,
-                description="Finds repositioning flights for spare crew. Expects JSON input with from_base, to_airport, sched_dep, delay_minutes, report_buffer."
+                description="Finds repositioning flights (direct, or connecting if no direct flight fits) for spare crew. Expects JSON input with from_base, to_airport, sched_dep, delay_minutes, report_buffer and optional earliest_departure, min_connection_minutes, max_options. Returns up to max_options flights ordered by arrival."
+            ),
+            Tool(
+                name="batch_reposition_finder",
+                func=self.batch_reposition_finder,
+                description="Finds reposition options for many spare candidates in one call. Expects JSON input with crew_ids (and/or from_bases), to_airport, sched_dep, delay_minutes, report_buffer."
+            ),
+            Tool(
+                name="plan_network_recovery",
+                func=self.plan_network_recovery,
+                description="Plans spare crew for every illegal crew position across all delayed flights at once. Expects JSON input with report_buffer and optional flight_ids."
             ),
             Tool(
                 name="book_hotel",
                 func=self.book_hotel,
-                description="Books hotel accommodation for affected crew. Expects JSON input with airport and crew_ids."
+                description="Books hotel accommodation for affected crew, split across several hotels when no single one has enough rooms. Expects JSON input with airport and crew_ids, and optional hold_minutes for a tentative hold."
+            ),
+            Tool(
+                name="book_hotels_batch",
+                func=self.book_hotels_batch,
+                description="Books hotel rooms for the stranded crew of many flights at one airport in one call. Expects JSON input with airport, requests (each with flight_id and crew_ids), and optional hold_minutes."
+            ),
+            Tool(
+                name="hotel_night_availability",
+                func=self.hotel_night_availability,
+                description="Shows rooms free on every night of a stay at each hotel at an airport. Expects JSON input with airport, first_night and last_night (YYYY-MM-DD)."
+            ),
+            Tool(
+                name="book_hotel_nights",
+                func=self.book_hotel_nights,
+                description="Books hotel rooms for a multi-night stay. Expects JSON input with airport, crew_ids, first_night and last_night (YYYY-MM-DD)."
             ),
             Tool(
                 name="arrange_transport",
                 func=self.arrange_transport,
-                description="Arranges ground transport to hotel for affected crew. Expects JSON input with airport, crew_ids, hotel."
+                description="Arranges ground transport to hotel for affected crew. Expects JSON input with airport, crew_ids, hotel, and optional hold_minutes for a tentative hold."
+            ),
+            Tool(
+                name="arrange_pooled_transport",
+                func=self.arrange_pooled_transport,
+                description="Arranges shared ground transport for the crews of many flights at once, pooling crews going to the same hotel within a time window into as few vehicles as possible. Expects JSON input with requests (each with flight_id, airport, hotel, crew_ids, ready_time) and optional window_minutes, hold_minutes."
+            ),
+            Tool(
+                name="book_reposition_seat",
+                func=self.book_reposition_seat,
+                description="Books a seat on a reposition flight for a spare crew member. Expects JSON input with flight_id and crew_id, and optional hold_minutes for a tentative hold."
+            ),
+            Tool(
+                name="confirm_reservation",
+                func=self.confirm_reservation,
+                description="Confirms a tentative hold on a hotel, transport or reposition seat. Expects JSON input with reservation_id."
+            ),
+            Tool(
+                name="release_reservation",
+                func=self.release_reservation,
+                description="Cancels a hotel, transport or reposition seat booking. Expects JSON input with reservation_id."
             ),
             Tool(
                 name="policy_retriever",
                 func=self.policy_retriever,
-                description="Retrieves relevant operational policy. Expects JSON input with a policy_query string."
+                description="Retrieves the best matching operational policies, ranked by relevance. Expects JSON input with a topic (free text) and optional top_k."
             ),
             Tool(
                 name="send_notification",
@@ -75,7 +188,323 @@ class StatusQueryTools():
             )
         ]
 
-    
+    def _normalize_time_fields(self, crew_roster_df):
+        """
+        Parses every roster and schedule time string into datetime64[m] arrays
+        once at load, aligned with the dataframe rows, so tools do integer
+        arithmetic instead of string parsing. The roster itself is kept only as
+        the compact roster store; its times live there next to the category codes.
+        """
+        self.roster_store = RosterStore(crew_roster_df, CREW_TIME_COLUMNS)
+        self.crew_times = self.roster_store.times
+        self.flight_times = normalize_time_columns(self.flight_schedule_df, FLIGHT_TIME_COLUMNS)
+        self.reposition_times = normalize_time_columns(self.reposition_flight_df, FLIGHT_TIME_COLUMNS)
+
+        self.flight_row_index = dict()
+        self.flight_delays = np.array([], dtype=np.int64)
+        if self.flight_schedule_df is not None:
+            self.flight_row_index = {
+                flight_id: position for position, flight_id in enumerate(self.flight_schedule_df["flight_id"])
+            }
+            self.flight_delays = (
+                pd.to_numeric(self.flight_schedule_df["delay_minutes"], errors="coerce")
+                .fillna(0).astype(np.int64).to_numpy()
+            )
+
+    def _crew_assignments(self):
+        """
+        (crew_id, flight_id) pairs of every crew assignment: crew_assignments_df when
+        given, otherwise each crew member's single assigned_flight_id.
+        """
+        if self.crew_assignments_df is not None:
+            return list(zip(self.crew_assignments_df["crew_id"], self.crew_assignments_df["flight_id"]))
+        store = self.roster_store
+        rows = np.flatnonzero(~store.missing("assigned_flight_id"))
+        return list(zip(store.crew_ids[rows], store.values("assigned_flight_id", rows)))
+
+    def _build_crew_indexes(self):
+        """
+        Builds crew_id -> roster row and flight_id -> roster rows lookups once, so
+        crew tools resolve ids in O(1) instead of scanning the roster. Flights get
+        their crew from the same assignments as the pairings (see _crew_assignments),
+        and a crew member with any of those legs is not a spare. The spare pool index
+        is grouped from the store's category codes.
+        """
+        store = self.roster_store
+        self.crew_row_index = store.row_of
+        self.flight_crew_index = dict()
+        self.crew_flights = dict()
+        self.spare_pool_index = dict()
+        self._spare_pool_keys = dict()
+        self.window_trees = dict()
+
+        for crew_id, flight_id in self._crew_assignments():
+            position = store.row_of.get(crew_id)
+            if position is not None and flight_id not in self.crew_flights.get(position, ()):
+                self.flight_crew_index.setdefault(flight_id, []).append(position)
+                self.crew_flights.setdefault(position, set()).add(flight_id)
+
+        spares = np.flatnonzero(self._spare_mask())
+        pool_keys = zip(store.values("role", spares), store.values("qualified_aircraft", spares))
+        for position, key in zip(spares.tolist(), pool_keys):
+            self.spare_pool_index.setdefault(key, set()).add(position)
+            self._spare_pool_keys[position] = key
+
+        self.crew_acclimated = np.ones(len(store), dtype=bool)
+        if "acclimated" in store.columns:
+            acclimated = store.values("acclimated", slice(None))
+            self.crew_acclimated = pd.Series(acclimated, dtype=object).fillna(True).to_numpy(dtype=bool)
+
+    def _build_pairings(self):
+        """
+        Links each crew member's consecutive flights into the pairing graph used for
+        delay propagation, and records them on the per-crew assignment timeline used
+        for future assignment checks.
+        """
+        self.pairings = PairingGraph(
+            self.flight_times["sched_dep"], self.flight_times["sched_arr"], MIN_TURN_MINUTES
+        )
+        self.assignment_timeline = AssignmentTimeline()
+        self._leg_keys = None
+        for crew_id, flight_id in self._crew_assignments():
+            flight_position = self.flight_row_index.get(flight_id)
+            if flight_position is not None:
+                self.pairings.add_assignment(crew_id, flight_position)
+                self._add_to_timeline(crew_id, flight_id, flight_position)
+
+    def _add_to_timeline(self, crew_id, flight_id, flight_position):
+        self.assignment_timeline.add(
+            crew_id, flight_id,
+            self.flight_times["sched_dep"][flight_position], self.flight_times["sched_arr"][flight_position],
+        )
+
+    def _build_delay_headroom(self):
+        """
+        Precomputes, per flight_schedule_df row, the largest delay in minutes every
+        assigned crew member can absorb: min over crew of the earlier of duty_end and
+        duty_start + max FDP, minus sched_arr. inf means no crew assigned, nan means
+        some assigned crew member has no duty_end on the roster.
+        """
+        n_flights = 0 if self.flight_schedule_df is None else len(self.flight_schedule_df)
+        self.delay_headroom = np.full(n_flights, np.inf)
+
+        crew_positions, flight_positions = [], []
+        for flight_id, positions in self.flight_crew_index.items():
+            flight_position = self.flight_row_index.get(flight_id)
+            if flight_position is not None:
+                crew_positions.extend(positions)
+                flight_positions.extend([flight_position] * len(positions))
+        if not crew_positions:
+            return
+
+        slack = self._duty_slack(np.array(crew_positions), np.array(flight_positions))
+        np.minimum.at(self.delay_headroom, np.array(flight_positions), slack)
+
+    def _duty_slack(self, crew_positions, flight_positions):
+        duty_end = self.crew_times["duty_end"][crew_positions]
+        sched_arr = self.flight_times["sched_arr"][flight_positions]
+        duty_start = self.crew_times["duty_start"][crew_positions]
+        max_fdp = self.fdp_limits.max_fdp_minutes(
+            duty_start, self._fdp_segments(crew_positions, sched_arr), self.crew_acclimated[crew_positions]
+        )
+        fdp_end = duty_start + max_fdp.astype("timedelta64[m]")
+        limit = np.where(np.isnat(fdp_end), duty_end, np.minimum(duty_end, fdp_end))
+
+        slack = (limit - sched_arr).astype(np.int64).astype(np.float64)
+        slack[np.isnat(duty_end) | np.isnat(sched_arr)] = np.nan
+        return slack
+
+    def _fdp_segments(self, crew_positions, scheduled_arrival):
+        """
+        Flight segments counted towards each crew member's FDP: the legs of their
+        pairing arriving no later than the checked flight's scheduled arrival, at least 1.
+        Counted with two searchsorted calls over the (roster row, leg arrival) keys.
+        """
+        crew_positions = np.asarray(crew_positions, dtype=np.int64)
+        scheduled_arrival = np.broadcast_to(np.asarray(scheduled_arrival, dtype="datetime64[m]"), crew_positions.shape)
+        leg_keys = self._fdp_leg_keys()
+        first = np.searchsorted(leg_keys, crew_positions << TIME_BITS, side="left")
+        last = np.searchsorted(
+            leg_keys, (crew_positions << TIME_BITS) | scheduled_arrival.astype(np.int64), side="right"
+        )
+        return np.where(np.isnat(scheduled_arrival), 1, np.maximum(last - first, 1))
+
+    def _fdp_leg_keys(self):
+        """
+        Sorted roster row << TIME_BITS | scheduled arrival of every pairing leg, rebuilt
+        on first use after the pairings change.
+        """
+        if self._leg_keys is None:
+            positions, legs = [], []
+            for position, flight_ids in self.crew_flights.items():
+                flights = [self.flight_row_index[flight_id] for flight_id in flight_ids if flight_id in self.flight_row_index]
+                positions.extend([position] * len(flights))
+                legs.extend(flights)
+            arrivals = self.flight_times["sched_arr"][np.array(legs, dtype=np.int64)]
+            positions = np.array(positions, dtype=np.int64)[~np.isnat(arrivals)]
+            keys = (positions << TIME_BITS) | arrivals[~np.isnat(arrivals)].astype(np.int64)
+            self._leg_keys = np.sort(keys)
+        return self._leg_keys
+
+    def _fdp_legality(self, crew_positions, projected_arrival, scheduled_arrival, pilots=2, rest_facility=1):
+        """
+        Flight duty period check for many crew at once: duty_start to projected_arrival
+        against the compiled FDP table, keyed by report time, the segments flown up to
+        the checked flight (see _fdp_segments) and the optional acclimated roster
+        column. Crew without a duty_start on the roster are not FDP-limited.
+        """
+        duty_start = self.crew_times["duty_start"][crew_positions]
+        fdp, max_fdp, legal = self.fdp_limits.evaluate(
+            duty_start, projected_arrival, self._fdp_segments(crew_positions, scheduled_arrival),
+            self.crew_acclimated[crew_positions], pilots, rest_facility
+        )
+        return fdp, max_fdp, legal | np.isnat(duty_start)
+
+    def _refresh_delay_headroom(self, flight_id):
+        flight_position = self.flight_row_index.get(flight_id)
+        if flight_position is None:
+            return
+        crew_positions = np.array(self.flight_crew_index.get(flight_id, []), dtype=np.int64)
+        if crew_positions.size == 0:
+            self.delay_headroom[flight_position] = np.inf
+            return
+        slack = self._duty_slack(crew_positions, np.full(crew_positions.size, flight_position))
+        self.delay_headroom[flight_position] = slack.min()
+
+    def _spare_mask(self):
+        """
+        Roster rows that are spares: active and without any assigned flight leg.
+        """
+        assigned = np.zeros(len(self.roster_store), dtype=bool)
+        assigned[list(self.crew_flights)] = True
+        return self.roster_store.mask(status="active") & ~assigned
+
+    def _is_spare(self, position):
+        store = self.roster_store
+        active = store.code("status", "active")
+        return active >= 0 and store.codes["status"][position] == active and not self.crew_flights.get(position)
+
+    def _refresh_spare_pool(self, position):
+        """
+        Moves one roster row in or out of the (role, qualified_aircraft) spare pool
+        index. A crew member is a spare while active and not assigned to a flight.
+        """
+        store = self.roster_store
+        previous_key = self._spare_pool_keys.pop(position, None)
+        if previous_key is not None:
+            self.spare_pool_index[previous_key].discard(position)
+
+        if self._is_spare(position):
+            key = (store.value("role", position), store.value("qualified_aircraft", position))
+            self.spare_pool_index.setdefault(key, set()).add(position)
+            self._spare_pool_keys[position] = key
+
+    def _window_tree(self, base, state):
+        """
+        Interval tree over the duty ([duty_start, duty_end]) or rest ([duty_end,
+        rest_until]) windows of the crew based at base, built on first use and
+        dropped by update_crew when one of its crew changes.
+        """
+        key = (base, state)
+        if key not in self.window_trees:
+            positions = np.flatnonzero(self.roster_store.mask(base=base))
+            if state == "duty":
+                starts, ends = self.crew_times["duty_start"][positions], self.crew_times["duty_end"][positions]
+            else:
+                starts, ends = self.crew_times["duty_end"][positions], self.crew_times["rest_until"][positions]
+            self.window_trees[key] = (positions, IntervalTree(starts, ends))
+        return self.window_trees[key]
+
+    def update_crew(self, crew_id, **fields):
+        """
+        Updates roster fields for one crew member and keeps the crew lookups and
+        parsed time columns in sync with the roster store.
+        e.g. update_crew("C010", assigned_flight_id="UA123", duty_start="2024-08-10 16:00")
+        Returns False if crew_id is not on the roster.
+        """
+        position = self.crew_row_index.get(crew_id)
+        if position is None:
+            return False
+
+        store = self.roster_store
+        previous_flight_id = store.value("assigned_flight_id", position)
+        previous_base = store.value("base", position)
+
+        for column, value in fields.items():
+            store.set_value(position, column, value)
+
+        previous_legs = set(self.crew_flights.get(position, ()))
+        if "assigned_flight_id" in fields:
+            # releasing clears the whole pairing; assigning replaces the roster flight's leg
+            flight_id = store.value("assigned_flight_id", position)
+            for leg in (previous_legs if flight_id is None else {previous_flight_id} & previous_legs):
+                self._remove_leg(crew_id, position, leg)
+            if flight_id is not None:
+                self._add_leg(crew_id, position, flight_id)
+
+        if {"assigned_flight_id", "status", "role", "qualified_aircraft"} & fields.keys():
+            self._refresh_spare_pool(position)
+
+        if {"base", *CREW_TIME_COLUMNS} & fields.keys():
+            for base in {previous_base, store.value("base", position)}:
+                self.window_trees.pop((base, "duty"), None)
+                self.window_trees.pop((base, "rest"), None)
+
+        if "acclimated" in fields:
+            self.crew_acclimated[position] = True if pd.isna(fields["acclimated"]) else bool(fields["acclimated"])
+
+        if {"assigned_flight_id", "duty_start", "duty_end", "acclimated"} & fields.keys():
+            # FDP segment counts, and so the headroom, depend on every leg of the pairing
+            for flight_id in previous_legs | self.crew_flights.get(position, set()):
+                self._refresh_delay_headroom(flight_id)
+
+        return True
+
+    def _add_leg(self, crew_id, position, flight_id):
+        legs = self.crew_flights.setdefault(position, set())
+        if flight_id in legs:
+            return
+        legs.add(flight_id)
+        self._leg_keys = None
+        self.flight_crew_index.setdefault(flight_id, []).append(position)
+        flight_position = self.flight_row_index.get(flight_id)
+        if flight_position is not None:
+            self.pairings.add_assignment(crew_id, flight_position)
+            self._add_to_timeline(crew_id, flight_id, flight_position)
+
+    def _remove_leg(self, crew_id, position, flight_id):
+        legs = self.crew_flights[position]
+        legs.discard(flight_id)
+        self._leg_keys = None
+        if not legs:
+            del self.crew_flights[position]
+        crew = self.flight_crew_index[flight_id]
+        crew.remove(position)
+        if not crew:
+            del self.flight_crew_index[flight_id]
+        flight_position = self.flight_row_index.get(flight_id)
+        if flight_position is not None:
+            self.pairings.remove_assignment(crew_id, flight_position)
+            self.assignment_timeline.remove(crew_id, flight_id)
+
+    def assign_crew(self, crew_id, flight_id):
+        """
+        Assigns a crew member to a flight, taking them out of the spare pool.
+        """
+        return self.update_crew(crew_id, assigned_flight_id=flight_id)
+
+    def release_crew(self, crew_id):
+        """
+        Releases a crew member from every leg of their pairing, returning them to the
+        spare pool if active.
+        """
+        return self.update_crew(crew_id, assigned_flight_id=None)
+
+    def set_crew_status(self, crew_id, status):
+        """
+        Changes a crew member's status (e.g. "active", "sick"); only active crew are spares.
+        """
+        return self.update_crew(crew_id, status=status)
 
     def add_affected_crew(self, action_input: str) -> str:
         """
@@ -130,22 +559,22 @@ class StatusQueryTools():
         flight_id = params.get("flight_id")
         crew_id = params.get("crew_id")
 
-        if self.crew_roster_df is None:
+        if not self.roster_store.columns:
             return json.dumps({"error": "Crew roster data not provided."})
 
         if flight_id:
             # Get all crew assigned to the specified flight
-            matched = self.crew_roster_df[self.crew_roster_df["assigned_flight_id"] == flight_id]
-            if matched.empty:
+            positions = self.flight_crew_index.get(flight_id)
+            if not positions:
                 return json.dumps({"message": f"No crew assigned to flight {flight_id}."})
-            return json.dumps(matched.to_dict(orient="records"))
+            return json.dumps(self.roster_store.records(positions))
 
         if crew_id:
             # Get specific crew member details
-            matched = self.crew_roster_df[self.crew_roster_df["crew_id"] == crew_id]
-            if matched.empty:
-                return {"message": f"Crew member {crew_id} not found."}
-            return json.dumps(matched.iloc[0].to_dict())
+            position = self.crew_row_index.get(crew_id)
+            if position is None:
+                return json.dumps({"message": f"Crew member {crew_id} not found."})
+            return json.dumps(self.roster_store.record(position))
 
         return json.dumps({"error": "Please provide either flight_id or crew_id for the query."})
     
@@ -154,9 +583,13 @@ class StatusQueryTools():
         action_input : {
                         "crew_ids": ["C001", "C002"],
                         "sched_arr": "2024-08-10 14:00",
-                        "delay_minutes": 210
+                        "delay_minutes": 210,
+                        "augmented_pilots": 3,   // optional, pilots on board of an augmented crew
+                        "rest_facility": 1       // optional, rest facility class 1-3
                         }
         duty_end should be computed by checking from the crew_roaster_df
+        The flight duty period from duty_start to projected arrival is checked against
+        the FDP table as well.
         """
         try:
             params = json.loads(action_input)
@@ -167,45 +600,235 @@ class StatusQueryTools():
         sched_arr = params.get("sched_arr")
         delay_minutes = int(params.get("delay_minutes"))
 
-        sched_arr = datetime.strptime(sched_arr, "%Y-%m-%d %H:%M")
-        delay = timedelta(minutes=delay_minutes)
-        projected_arrival = sched_arr + delay
+        projected_arrival = parse_time(sched_arr) + np.timedelta64(delay_minutes, "m")
+
+        crew_ids = [crew_id for crew_id in crew_ids if crew_id]
+        positions = [self.crew_row_index.get(crew_id) for crew_id in crew_ids]
+
+        for crew_id, position in zip(crew_ids, positions):
+            if position is None:
+                return json.dumps({"error": f"crew id {crew_id} not found"})
+
+        # one vectorized comparison for the whole crew instead of a filter per crew
+        duty_end = self.crew_times["duty_end"][positions]
+        missing_duty_end = np.isnat(duty_end)
+        if missing_duty_end.any():
+            crew_id = crew_ids[int(np.argmax(missing_duty_end))]
+            return json.dumps(
+                {"error": f"Error processing crew id {crew_id}; no duty_end on roster"}
+            )
+
+        pilots = int(params.get("augmented_pilots") or 2)
+        rest_facility = int(params.get("rest_facility") or 1)
+        fdp, max_fdp, fdp_legal = self._fdp_legality(
+            np.array(positions, dtype=np.int64), projected_arrival, parse_time(sched_arr), pilots, rest_facility
+        )
+
+        past_duty_end = duty_end < projected_arrival
+        not_legal = past_duty_end | ~fdp_legal
+        duty_end_str = format_time_column(duty_end)
+        projected_arrival_str = format_time(projected_arrival)
 
         result = {}
-        for crew_id in crew_ids:
-            if crew_id:
-                
-                try:
-                    duty_end_series = self.crew_roster_df.loc[
-                        self.crew_roster_df["crew_id"] == crew_id, "duty_end"
-                    ]
-                    
-                    if duty_end_series.empty:
-                        return json.dumps({"error": f"crew id {crew_id} not found"})
-                    
-                    duty_end = duty_end_series.iloc[0]
-                    duty_end = datetime.strptime(duty_end, "%Y-%m-%d %H:%M")
-                except Exception as e:
-                    return json.dumps(
-                        {"error": f"Error processing crew id{crew_id}; {e}"}
-                    )
-                
-                status = "not legal" if duty_end < projected_arrival else "legal"
-                
-                result[crew_id] = {
-                    "duty_end": duty_end.strftime("%Y-%m-%d %H:%M"),
-                    "projected_arrival" : projected_arrival.strftime("%Y-%m-%d %H:%M"),
-                    "status": status
-                    }
+        for index, crew_id in enumerate(crew_ids):
+            result[crew_id] = {
+                "duty_end": duty_end_str[index],
+                "projected_arrival" : projected_arrival_str,
+                "fdp_minutes": int(fdp[index]),
+                "max_fdp_minutes": int(max_fdp[index]),
+                "status": "not legal" if not_legal[index] else "legal"
+                }
+            if not fdp_legal[index]:
+                result[crew_id]["reason"] = "maximum flight duty period exceeded"
+            elif past_duty_end[index]:
+                result[crew_id]["reason"] = "projected arrival after duty_end"
         
         return json.dumps(result)
 
+    def delay_headroom_check(self, action_input: str) -> str:
+        """
+        action_input = {
+            "flight_id": "UA123",
+            "delay_minutes": 210
+        }
+        Compares a delay against the flight's precomputed headroom (minimum over the
+        assigned crew of the earlier of duty_end and duty_start + max FDP, minus
+        sched_arr). A delay within headroom keeps every assigned crew member legal on
+        both counts, so no further legality checks are needed.
+        """
+        try:
+            params = json.loads(action_input)
+        except json.JSONDecodeError:
+            return json.dumps({"error": "Invalid input format"})
+
+        flight_id = params.get("flight_id")
+        if not flight_id or params.get("delay_minutes") is None:
+            return json.dumps({"error": "Missing flight_id or delay_minutes"})
+
+        flight_position = self.flight_row_index.get(flight_id)
+        if flight_position is None:
+            return json.dumps({"error": f"Flight {flight_id} not found"})
+
+        delay_minutes = int(params.get("delay_minutes"))
+        headroom = self.delay_headroom[flight_position]
+
+        if np.isnan(headroom):
+            return json.dumps({
+                "flight_id": flight_id,
+                "headroom_minutes": None,
+                "within_headroom": False,
+                "message": "Headroom unknown: an assigned crew member has no duty_end. Use duty_hour_checker."
+            })
+
+        if np.isinf(headroom):
+            return json.dumps({
+                "flight_id": flight_id,
+                "headroom_minutes": None,
+                "within_headroom": True,
+                "message": f"No crew assigned to flight {flight_id}"
+            })
+
+        within_headroom = bool(delay_minutes <= headroom)
+        return json.dumps({
+            "flight_id": flight_id,
+            "delay_minutes": delay_minutes,
+            "headroom_minutes": int(headroom),
+            "within_headroom": within_headroom,
+            "message": (
+                "Delay is within crew duty headroom; all assigned crew remain legal"
+                if within_headroom else
+                "Delay exceeds crew duty headroom; check legality with duty_hour_checker"
+            )
+        })
+
+    def delay_propagation(self, action_input: str) -> str:
+        """
+        action_input = {
+            "flight_id": "UA123",
+            "delay_minutes": 210
+        }
+        Propagates a delay through crew pairings: every later flight flown by the same
+        crew is pushed back when they cannot make it with MIN_TURN_MINUTES to spare.
+        Returns the downstream flights whose delay grows and the crew whose legality
+        (duty_end and the FDP limit) changes because of it.
+        """
+        try:
+            params = json.loads(action_input)
+        except json.JSONDecodeError:
+            return json.dumps({"error": "Invalid input format"})
+
+        flight_id = params.get("flight_id")
+        if not flight_id or params.get("delay_minutes") is None:
+            return json.dumps({"error": "Missing flight_id or delay_minutes"})
+
+        flight_position = self.flight_row_index.get(flight_id)
+        if flight_position is None:
+            return json.dumps({"error": f"Flight {flight_id} not found"})
+
+        delays = self.pairings.propagate(flight_position, int(params["delay_minutes"]), self.flight_delays)
+
+        schedule = self.flight_schedule_df
+        affected_flights = []
+        for position, delay in sorted(delays.items(), key=lambda item: self.flight_times["sched_dep"][item[0]]):
+            affected_flights.append({
+                "flight_id": schedule["flight_id"].iloc[position],
+                "previous_delay_minutes": int(self.flight_delays[position]),
+                "propagated_delay_minutes": delay,
+                "projected_dep": format_time(self.flight_times["sched_dep"][position] + np.timedelta64(delay, "m")),
+                "projected_arr": format_time(self.flight_times["sched_arr"][position] + np.timedelta64(delay, "m")),
+            })
+
+        # legality before and after, for every crew leg on an affected flight at once
+        crew_ids, crew_flights = [], []
+        for position in delays:
+            for crew_id in self.pairings.flight_crew.get(position, ()):
+                if crew_id in self.crew_row_index:
+                    crew_ids.append(crew_id)
+                    crew_flights.append(position)
+
+        legality_changes = []
+        if crew_ids:
+            crew_flights = np.array(crew_flights, dtype=np.int64)
+            new_delay = np.array([delays[position] for position in crew_flights], dtype=np.int64)
+            crew_positions = np.array([self.crew_row_index[crew_id] for crew_id in crew_ids], dtype=np.int64)
+            duty_end = self.crew_times["duty_end"][crew_positions]
+            sched_arr = self.flight_times["sched_arr"][crew_flights]
+            previous_arrival = sched_arr + self.flight_delays[crew_flights].astype("timedelta64[m]")
+            projected_arrival = sched_arr + new_delay.astype("timedelta64[m]")
+            legal_before = (previous_arrival <= duty_end) & self._fdp_legality(crew_positions, previous_arrival, sched_arr)[2]
+            fdp, max_fdp, fdp_legal = self._fdp_legality(crew_positions, projected_arrival, sched_arr)
+            legal_after = (projected_arrival <= duty_end) & fdp_legal
+
+            for index in np.flatnonzero(legal_before != legal_after):
+                legality_changes.append({
+                    "crew_id": crew_ids[index],
+                    "flight_id": schedule["flight_id"].iloc[crew_flights[index]],
+                    "duty_end": format_time(duty_end[index]),
+                    "projected_arrival": format_time(projected_arrival[index]),
+                    "fdp_minutes": int(fdp[index]),
+                    "max_fdp_minutes": int(max_fdp[index]),
+                    "status": "legal" if legal_after[index] else "not legal",
+                })
+
+        return json.dumps({
+            "affected_flights": affected_flights,
+            "crew_legality_changes": legality_changes,
+            "message": f"Delay reaches {len(affected_flights) - 1} downstream flights and changes legality for {len(legality_changes)} crew legs"
+        })
+
+    def crew_on_duty_finder(self, action_input: str) -> str:
+        """
+        action_input = {
+            "airport": "ORD",
+            "time": "2024-08-10 12:00",      // or a window with "start" and "end"
+            "state": "duty"                  // optional, "duty" (default) or "rest"
+        }
+        Crew based at airport whose duty window (duty_start to duty_end) or rest window
+        (duty_end to rest_until) overlaps the given time or window.
+        """
+        try:
+            params = json.loads(action_input)
+        except json.JSONDecodeError:
+            return json.dumps({"error": "Invalid input format"})
+
+        airport = params.get("airport")
+        state = params.get("state", "duty")
+        start = params.get("start") or params.get("time")
+        end = params.get("end") or params.get("time")
+
+        if not airport or not start or not end:
+            return json.dumps({"error": "Missing airport and time (or start and end)"})
+        if state not in ("duty", "rest"):
+            return json.dumps({"error": "state must be duty or rest"})
+        if not self.roster_store.columns:
+            return json.dumps({"error": "Crew roster data not provided."})
+
+        start, end = parse_time(start), parse_time(end)
+        if np.isnat(start) or np.isnat(end) or end < start:
+            return json.dumps({"error": "Invalid time window"})
+
+        base_positions, tree = self._window_tree(airport, state)
+        positions = base_positions[tree.overlapping(start, end)]
+        if positions.size == 0:
+            return json.dumps({"message": f"No crew based at {airport} on {state} at that time"})
+
+        result = self.roster_store.records(
+            positions, ["crew_id", "name", "role", "status", "assigned_flight_id", *CREW_TIME_COLUMNS]
+        )
+        return json.dumps(result)
+
     def query_spare_pool(self, action_input: str) -> str:
         """
         action_input =     {
                 "required_role": "<role>",   // e.g. "captain" or "FO"
                 "qualified_aircraft": "<aircraft type>",
-                "exclude_crew_ids": [ ... ]  // to avoid picking current assigned crew
+                "exclude_crew_ids": [ ... ],  // to avoid picking current assigned crew
+                // optional ranked mode, returns only the best top_k spares:
+                "top_k": 3,
+                "departure_airport": "ORD",
+                "sched_dep": "2024-08-10 08:00",
+                "delay_minutes": 210,
+                "report_buffer": 60
             }
 
         """
@@ -222,18 +845,151 @@ class StatusQueryTools():
         if not required_role or not qualified_aircraft:
             return json.dumps({"error": "Missing required_role or qualified_aircraft"})
         
-        spare_crew = self.crew_roster_df[
-            (self.crew_roster_df["role"] == required_role) &
-            (self.crew_roster_df["qualified_aircraft"] == qualified_aircraft) &
-            (~ self.crew_roster_df["crew_id"].isin(exclude_crew_ids)) &
-            (self.crew_roster_df["status"] == "active") &
-            (self.crew_roster_df["assigned_flight_id"].isnull())
-        ]
+        excluded_positions = {
+            self.crew_row_index[crew_id] for crew_id in exclude_crew_ids
+            if crew_id in self.crew_row_index
+        }
+        candidate_positions = sorted(
+            self.spare_pool_index.get((required_role, qualified_aircraft), set()) - excluded_positions
+        )
 
-        if spare_crew.empty:
+        if not candidate_positions:
             return json.dumps({"message": "No matching spare crew"})
 
-        result = spare_crew[["crew_id", "name", "base", "rest_until"]].to_dict(orient="records")
+        if params.get("top_k") is not None:
+            departure_airport = params.get("departure_airport")
+            sched_dep = params.get("sched_dep")
+            if not departure_airport or not sched_dep:
+                return json.dumps({"error": "Ranked mode needs departure_airport and sched_dep"})
+
+            report_time = (
+                parse_time(sched_dep)
+                + np.timedelta64(int(params.get("delay_minutes", 0)), "m")
+                - np.timedelta64(int(params.get("report_buffer", 0)), "m")
+            )
+            return json.dumps(
+                self._rank_spares(
+                    np.array(candidate_positions), departure_airport, report_time, int(params["top_k"])
+                )
+            )
+
+        result = self.roster_store.records(candidate_positions, ["crew_id", "name", "base", "rest_until"])
+
+        return json.dumps(result)
+
+    def _rank_spares(self, positions, departure_airport, report_time, top_k):
+        """
+        Scores spare candidates in one vectorized pass and returns the top_k, best first.
+        Ordering: rest complete by report_time, then able to reach departure_airport
+        by report_time, then already based there, then arrival time. Reposition
+        routes, with connections, come from one reverse connection scan per call.
+        """
+        self._expire_holds()
+        no_time = np.datetime64("NaT", "m")
+        rest_until = self.crew_times["rest_until"][positions]
+        ready_time = np.where(np.isnat(rest_until), report_time, rest_until)
+        store = self.roster_store
+        base = store.codes["base"][positions]
+
+        rest_complete = ready_time <= report_time
+        same_base = (base >= 0) & (base == store.code("base", departure_airport))
+
+        # latest reposition itinerary from every base that still makes report_time,
+        # looked up per candidate by base code
+        latest = self.reposition_router.latest_departures(
+            departure_airport, report_time, MIN_CONNECTION_MINUTES, ready_time.min()
+        )
+        base_departure = np.full(len(store.categories["base"]) + 1, no_time)
+        base_arrival = np.full(len(store.categories["base"]) + 1, no_time)
+        base_legs = dict()
+        for airport, route in latest.items():
+            code = store.code("base", airport)
+            if code >= 0:
+                base_departure[code] = np.datetime64(route["departure"], "m")
+                base_arrival[code] = self.reposition_times["sched_arr"][route["legs"][-1]]
+                base_legs[code] = route["legs"]
+
+        usable = ~np.isnat(base_departure[base]) & (base_departure[base] >= ready_time)
+        flight_arrival = np.where(usable, base_arrival[base], no_time)
+
+        arrival = np.where(same_base, ready_time, flight_arrival)
+        reachable = ~np.isnat(arrival) & (arrival <= report_time)
+
+        # one integer key per candidate so a partial sort can pick the top_k
+        span = np.int64(2**32)
+        arrival_offset = np.where(
+            np.isnat(arrival), span - 1,
+            np.clip((arrival - report_time).astype(np.int64) + 2**31, 0, span - 2)
+        )
+        penalty = (~rest_complete) * 4 + (~reachable) * 2 + (~same_base) * 1
+        score = penalty.astype(np.int64) * span + arrival_offset
+
+        top_k = max(1, min(top_k, len(positions)))
+        top = np.argpartition(score, top_k - 1)[:top_k] if top_k < len(positions) else np.arange(len(positions))
+        top = top[np.argsort(score[top], kind="stable")]
+
+        crew = store.records(positions[top], ["crew_id", "name", "base"])
+        ranked = []
+        for i, row in zip(top, crew):
+            ranked.append({
+                "crew_id": row["crew_id"],
+                "name": row["name"],
+                "base": row["base"],
+                "rest_until": format_time(rest_until[i]),
+                "rest_complete": bool(rest_complete[i]),
+                "same_base": bool(same_base[i]),
+                "reachable_by_report_time": bool(reachable[i]),
+                "arrival": format_time(arrival[i]),
+                "reposition_flight_ids": (
+                    self.reposition_flight_df["flight_id"].iloc[base_legs[base[i]]].tolist()
+                    if not same_base[i] and usable[i] else []
+                ),
+            })
+
+        return ranked
+
+    def check_crew_future_assignment(self, action_input: str) -> str:
+        """
+        action_input = {
+            "crew_ids": ["C010", "C011"],
+            "start": "2024-08-10 10:30",     // proposed duty window for the spare
+            "end": "2024-08-10 17:30",
+            "min_turn_minutes": 30           // optional
+        }
+        For each crew member: the first existing assignment that overlaps the proposed
+        window (conflict) and the next assignment after it.
+        """
+        try:
+            params = json.loads(action_input)
+        except json.JSONDecodeError:
+            return json.dumps({"error": "Invalid input format"})
+
+        crew_ids = [crew_id for crew_id in params.get("crew_ids") or [] if crew_id]
+        start, end = params.get("start"), params.get("end")
+        if not crew_ids or not start or not end:
+            return json.dumps({"error": "Missing crew_ids, start or end"})
+
+        start, end = parse_time(start), parse_time(end)
+        if np.isnat(start) or np.isnat(end) or end < start:
+            return json.dumps({"error": "Invalid time window"})
+
+        for crew_id in crew_ids:
+            if crew_id not in self.crew_row_index:
+                return json.dumps({"error": f"crew id {crew_id} not found"})
+
+        checked = self.assignment_timeline.check_batch(
+            crew_ids, start, end, int(params.get("min_turn_minutes", MIN_TURN_MINUTES))
+        )
+        next_start = format_time_column(checked["next_start"])
+
+        result = {}
+        for index, crew_id in enumerate(crew_ids):
+            result[crew_id] = {
+                "conflict": bool(checked["conflict"][index]),
+                "conflict_flight_id": checked["conflict_flight_id"][index],
+                "next_assignment": checked["next_flight_id"][index],
+                "next_assignment_start": next_start[index],
+            }
 
         return json.dumps(result)
 
@@ -245,8 +1001,13 @@ class StatusQueryTools():
                         "to_airport": "ORD",
                         "sched_dep": "2024-08-10 08:00",
                         "delay_minutes": 210,
-                        "report_buffer": 60
+                        "report_buffer": 60,
+                        // optional
+                        "earliest_departure": "2024-08-10 06:00",  // e.g. the spare's rest_until
+                        "min_connection_minutes": 45,
+                        "max_options": 3
                     }
+        Returns up to max_options direct flights ordered by arrival. Falls back to a connecting itinerary when no direct flight meets required_time.
         """
         
         try:
@@ -261,50 +1022,134 @@ class StatusQueryTools():
         report_buffer = int(params.get("report_buffer"))
         delay_minutes = int(params.get("delay_minutes"))
 
-        sched_dep = datetime.strptime(sched_dep, "%Y-%m-%d %H:%M")
-        delay = timedelta(minutes=delay_minutes)
-        projected_dep = sched_dep + delay
-        required_time = projected_dep - timedelta(minutes=report_buffer)
+        earliest_departure = parse_time(params.get("earliest_departure"))
+        min_connection_minutes = int(params.get("min_connection_minutes", MIN_CONNECTION_MINUTES))
 
-        df_copy = self.reposition_flight_df
-        df_copy['sched_arr_dt'] = pd.to_datetime(df_copy['sched_arr'], format="%Y-%m-%d %H:%M")
+        projected_dep = parse_time(sched_dep) + np.timedelta64(delay_minutes, "m")
+        required_time = projected_dep - np.timedelta64(report_buffer, "m")
 
-        available_flights = df_copy[
-            (df_copy['origin'] == from_base) &
-            (df_copy['destination'] == to_airport) &
-            (df_copy['seats_available']) &
-            (df_copy['sched_arr_dt'] <= required_time)
-        ].drop(columns='sched_arr_dt')
+        max_options = int(params.get("max_options", MAX_REPOSITION_OPTIONS))
+        self._expire_holds()
+        option_positions = self.reposition_index.arriving_by(
+            from_base, to_airport, required_time, earliest_departure
+        )[:max_options]
 
-        if available_flights.empty:
+        if option_positions.size == 0:
+            legs = self.reposition_router.earliest_arrival(
+                from_base, to_airport, required_time, earliest_departure, min_connection_minutes
+            )
+            if legs:
+                return json.dumps(
+                    {
+                        "required_time": format_time(required_time),
+                        "itinerary": self.reposition_flight_df.iloc[legs].to_dict(orient="records"),
+                        "message": "No direct reposition flight; connecting itinerary found"
+                    }
+                )
             return json.dumps(
                 {
-                    "required_time": required_time.strftime("%Y-%m-%d %H:%M"),
+                    "required_time": format_time(required_time),
                     "message": "No reposition flight found meeting required time"
                 }
             )
-        
-        
 
-        earliest_available_flight = (
-            available_flights
-            .sort_values(by='sched_arr')
-            .iloc[0]
-        )
+        available_flights = self.reposition_flight_df.iloc[option_positions].to_dict(orient="records")
+        for flight in available_flights:
+            flight["seats_available"] = self.reposition_index.seats_for(flight["flight_id"])
 
         result = {
-            "required_time": required_time.strftime("%Y-%m-%d %H:%M"),
-            "earliest_available_flight": earliest_available_flight.to_dict()
+            "required_time": format_time(required_time),
+            "earliest_available_flight": available_flights[0],
+            "available_flights": available_flights
         }
 
 
         return json.dumps(result)
 
+    def batch_reposition_finder(self, action_input: str) -> str:
+        """
+        action_input = {
+            "crew_ids": ["C010", "C011"],   // spare candidates; base and rest_until come from the roster
+            "from_bases": ["DEN"],          // optional extra bases without a specific crew member
+            "to_airport": "ORD",
+            "sched_dep": "2024-08-10 08:00",
+            "delay_minutes": 210,
+            "report_buffer": 60,
+            "min_connection_minutes": 45    // optional
+        }
+        Finds reposition options for every candidate at once with one reverse scan
+        over the reposition flights towards to_airport.
+        """
+        try:
+            params = json.loads(action_input)
+        except json.JSONDecodeError:
+            return json.dumps({"error": "Invalid input format"})
+
+        crew_ids = params.get("crew_ids", [])
+        from_bases = params.get("from_bases", [])
+        to_airport = params.get("to_airport")
+        sched_dep = params.get("sched_dep")
+
+        if (not crew_ids and not from_bases) or not to_airport or not sched_dep:
+            return json.dumps({"error": "Missing crew_ids/from_bases, to_airport or sched_dep"})
+
+        delay_minutes = int(params.get("delay_minutes", 0))
+        report_buffer = int(params.get("report_buffer", 0))
+        min_connection_minutes = int(params.get("min_connection_minutes", MIN_CONNECTION_MINUTES))
+        required_time = (
+            parse_time(sched_dep)
+            + np.timedelta64(delay_minutes, "m")
+            - np.timedelta64(report_buffer, "m")
+        )
+
+        candidates = []
+        for crew_id in crew_ids:
+            position = self.crew_row_index.get(crew_id)
+            if position is None:
+                return json.dumps({"error": f"crew id {crew_id} not found"})
+            candidates.append({
+                "crew_id": crew_id,
+                "base": self.roster_store.value("base", position),
+                "ready": self.crew_times["rest_until"][position],
+            })
+        for base in from_bases:
+            candidates.append({"crew_id": None, "base": base, "ready": np.datetime64("NaT", "m")})
+
+        ready_times = np.array([candidate["ready"] for candidate in candidates], dtype="datetime64[m]")
+        not_before = None if np.isnat(ready_times).any() else ready_times.min()
+        self._expire_holds()
+        latest = self.reposition_router.latest_departures(
+            to_airport, required_time, min_connection_minutes, not_before
+        )
+
+        options = []
+        for candidate in candidates:
+            ready = candidate["ready"]
+            option = {"crew_id": candidate["crew_id"], "base": candidate["base"], "feasible": False}
+            if candidate["base"] == to_airport:
+                option["feasible"] = bool(np.isnat(ready) or ready <= required_time)
+                option["itinerary"] = []
+            elif candidate["base"] in latest:
+                route = latest[candidate["base"]]
+                departure = np.datetime64(route["departure"], "m")
+                if np.isnat(ready) or departure >= ready:
+                    option["feasible"] = True
+                    option["latest_departure"] = format_time(departure)
+                    option["itinerary"] = self.reposition_flight_df.iloc[route["legs"]].to_dict(orient="records")
+            options.append(option)
+
+        return json.dumps({
+            "required_time": format_time(required_time),
+            "options": options,
+            "message": f"{sum(option['feasible'] for option in options)} of {len(options)} candidates can reach {to_airport} in time"
+        })
+
     def book_hotel(self, action_input: str) -> str:
         """
         action_input = {
             "airport": "ORD",
-            "crew_ids": ["C001", "C002"]
+            "crew_ids": ["C001", "C002"],
+            "hold_minutes": 15  // optional, places a tentative hold instead of booking
         }
         """
         try:
@@ -320,30 +1165,272 @@ class StatusQueryTools():
 
         rooms_needed = len(crew_ids)
 
-        available_hotels = self.hotels_df[
-            (self.hotels_df["airport"] == airport) &
-            (self.hotels_df["rooms_available"] >= rooms_needed)
-        ]
+        bookings = self.reservations.hold_split(
+            "hotel", airport, [rooms_needed], [crew_ids], ttl_seconds=self._hold_ttl(params)
+        )[0]
 
-        if available_hotels.empty:
+        if bookings is None:
             return json.dumps({"message": "No rooms available at airport hotels"})
-        
-        selected_hotel = available_hotels["hotel_name"].iloc[0]
-        result = {
-            "hotel": selected_hotel,
+
+        if len(bookings) == 1:
+            result = {
+                "hotel": bookings[0]["name"],
+                "rooms_booked": rooms_needed,
+                "crew_ids": crew_ids,
+                **self._finish_booking(bookings[0], "Hotel booked successfully")
+            }
+            return json.dumps(result)
+
+        return json.dumps({
+            "allocations": self._hotel_allocations(bookings, crew_ids),
             "rooms_booked": rooms_needed,
             "crew_ids": crew_ids,
-            "message": "Hotel booked successfully"
+            "message": f"Hotel rooms booked across {len(bookings)} hotels",
+        })
+
+    def book_hotels_batch(self, action_input: str) -> str:
+        """
+        action_input = {
+            "airport": "ORD",
+            "requests": [
+                {"flight_id": "UA123", "crew_ids": ["C001", "C002"]},
+                {"flight_id": "UA456", "crew_ids": ["C003"]}
+            ],
+            "hold_minutes": 15  // optional, places tentative holds instead of bookings
         }
+        Allocates rooms for every request in one pass over the airport's hotels, in
+        request order, splitting a request across hotels when no single one can take it.
+        """
+        try:
+            params = json.loads(action_input)
+        except json.JSONDecodeError:
+            return json.dumps({"error": "Invalid input format"})
 
-        return json.dumps(result)
+        airport = params.get("airport")
+        requests = params.get("requests") or []
+
+        if not airport or not requests:
+            return json.dumps({"error": "Missing airport or requests"})
+        if any(not request.get("crew_ids") for request in requests):
+            return json.dumps({"error": "Every request needs crew_ids"})
+
+        crew_lists = [request["crew_ids"] for request in requests]
+        allocations = self.reservations.hold_split(
+            "hotel", airport, [len(crew_ids) for crew_ids in crew_lists], crew_lists,
+            ttl_seconds=self._hold_ttl(params),
+        )
+
+        results = []
+        for request, crew_ids, bookings in zip(requests, crew_lists, allocations):
+            entry = {"flight_id": request.get("flight_id"), "crew_ids": crew_ids}
+            if bookings is None:
+                entry["message"] = "No rooms available at airport hotels"
+            else:
+                entry["rooms_booked"] = len(crew_ids)
+                entry["allocations"] = self._hotel_allocations(bookings, crew_ids)
+            results.append(entry)
+
+        booked = sum(bookings is not None for bookings in allocations)
+        return json.dumps({
+            "airport": airport,
+            "results": results,
+            "message": f"{booked} of {len(requests)} requests booked"
+        })
+
+    def hotel_night_availability(self, action_input: str) -> str:
+        """
+        action_input = {
+            "airport": "ORD",
+            "first_night": "2024-08-10",
+            "last_night": "2024-08-12"
+        }
+        Rooms free on every one of the nights at each hotel at the airport.
+        """
+        try:
+            params = json.loads(action_input)
+        except json.JSONDecodeError:
+            return json.dumps({"error": "Invalid input format"})
+
+        airport = params.get("airport")
+        first_night, last_night = params.get("first_night"), params.get("last_night")
+        if not airport or not first_night or not last_night:
+            return json.dumps({"error": "Missing airport, first_night or last_night"})
+
+        try:
+            rooms = self._hotel_night_rooms(airport, first_night, last_night)
+        except ValueError as error:
+            return json.dumps({"error": str(error)})
+
+        if not rooms:
+            return json.dumps({"message": f"No hotels at {airport}"})
+
+        return json.dumps({
+            "airport": airport,
+            "first_night": first_night,
+            "last_night": last_night,
+            "rooms_available": rooms
+        })
+
+    def book_hotel_nights(self, action_input: str) -> str:
+        """
+        action_input = {
+            "airport": "ORD",
+            "crew_ids": ["C001", "C002"],
+            "first_night": "2024-08-10",
+            "last_night": "2024-08-12"
+        }
+        Books rooms for every night of the stay, at the first hotel in preference order
+        that has them all, otherwise split across hotels.
+        """
+        try:
+            params = json.loads(action_input)
+        except json.JSONDecodeError:
+            return json.dumps({"error": "Invalid input format"})
+
+        airport = params.get("airport")
+        crew_ids = params.get("crew_ids", [])
+        first_night, last_night = params.get("first_night"), params.get("last_night")
+        if not airport or not crew_ids or not first_night or not last_night:
+            return json.dumps({"error": "Missing airport, crew_ids, first_night or last_night"})
+
+        try:
+            rooms = self._hotel_night_rooms(airport, first_night, last_night)
+        except ValueError as error:
+            return json.dumps({"error": str(error)})
+
+        rooms_needed = len(crew_ids)
+        hotels = [name for name in self.hotel_preference.get(airport, []) if rooms.get(name, 0) > 0]
+        if sum(rooms[name] for name in hotels) < rooms_needed:
+            return json.dumps({"message": "No rooms available at airport hotels for those nights"})
+
+        single = next((name for name in hotels if rooms[name] >= rooms_needed), None)
+        plan = [(single, rooms_needed)] if single is not None else []
+        if single is None:
+            needed = rooms_needed
+            for name in hotels:
+                take = min(rooms[name], needed)
+                plan.append((name, take))
+                needed -= take
+                if needed == 0:
+                    break
+
+        allocations, start = [], 0
+        for name, take in plan:
+            reservation_id = self._reserve_hotel_nights(
+                airport, name, take, first_night, last_night, crew_ids[start:start + take]
+            )
+            if reservation_id is None:
+                # another worker took the rooms in between; give back what this call got
+                for allocation in allocations:
+                    self._release_hotel_stay(allocation["reservation_id"])
+                return json.dumps({"message": "No rooms available at airport hotels for those nights"})
+            allocations.append({
+                "hotel": name,
+                "rooms_booked": take,
+                "crew_ids": crew_ids[start:start + take],
+                "reservation_id": reservation_id,
+            })
+            start += take
+
+        return json.dumps({
+            "allocations": allocations,
+            "first_night": first_night,
+            "last_night": last_night,
+            "rooms_booked": rooms_needed,
+            "message": "Hotel nights booked successfully"
+        })
+
+    def _split_stay(self, first_night, last_night):
+        """
+        Splits a stay into whether it includes the first night, whose rooms the
+        reservation engine holds, and the (first, last) range of later nights held
+        by the calendar, or None. Raises ValueError outside the calendar horizon.
+        """
+        first, last = np.datetime64(first_night, "D"), np.datetime64(last_night, "D")
+        tonight = self.hotel_first_night
+        horizon_end = tonight + np.timedelta64(HOTEL_CALENDAR_DAYS - 1, "D")
+        if first < tonight or last > horizon_end or last < first:
+            raise ValueError(f"nights must fall within {tonight} .. {horizon_end}")
+        later = (max(first, tonight + np.timedelta64(1, "D")), last) if last > tonight else None
+        return first == tonight, later
+
+    def _hotel_night_rooms(self, airport, first_night, last_night):
+        """
+        Rooms free on every night of the stay per hotel at airport, in preference order.
+        """
+        includes_first, later = self._split_stay(first_night, last_night)
+        rooms = self.hotel_calendar.availability(airport, *later) if later is not None else None
+        result = dict()
+        for name in self.hotel_preference.get(airport, []):
+            free = rooms.get(name, 0) if rooms is not None else None
+            if includes_first:
+                tonight = self.reservations.available("hotel", airport, name)
+                free = tonight if free is None else min(free, tonight)
+            result[name] = free
+        return result
+
+    def _reserve_hotel_nights(self, airport, name, rooms, first_night, last_night, crew_ids):
+        """
+        Takes rooms at one hotel for every night of the stay: the first night through
+        the reservation engine, later nights through the calendar. Returns the
+        reservation id, or None (with nothing taken) if some night lacks rooms.
+        """
+        includes_first, later = self._split_stay(first_night, last_night)
+        hold = None
+        if includes_first:
+            hold = self.reservations.hold("hotel", airport, name, rooms, owner=crew_ids)
+            if hold is None:
+                return None
+            self.reservations.confirm(hold["hold_id"])
+            if later is None:
+                return hold["hold_id"]
+
+        nights = self.hotel_calendar.reserve(airport, name, rooms, *later, owner=crew_ids)
+        if nights is None:
+            if hold is not None:
+                self.reservations.release(hold["hold_id"])
+            return None
+        if hold is None:
+            return nights["booking_id"]
+
+        self.hotel_stays[hold["hold_id"]] = nights["booking_id"]
+        return hold["hold_id"]
+
+    def _release_hotel_stay(self, reservation_id):
+        """
+        Releases a hotel stay from wherever its nights are held. Returns the released
+        hotel name and room count, or None if there is no such reservation.
+        """
+        released = self.reservations.release(reservation_id)
+        nights = self.hotel_calendar.release(self.hotel_stays.pop(reservation_id, reservation_id))
+        if released is not None:
+            return released["name"], released["quantity"]
+        if nights is not None:
+            return nights["name"], nights["rooms"]
+        return None
+
+    def _hotel_allocations(self, bookings, crew_ids):
+        """
+        One entry per hotel a request was split into, with the crew staying there.
+        """
+        allocations, start = [], 0
+        for booking in bookings:
+            allocations.append({
+                "hotel": booking["name"],
+                "rooms_booked": booking["quantity"],
+                "crew_ids": crew_ids[start:start + booking["quantity"]],
+                **self._finish_booking(booking, "Hotel booked successfully")
+            })
+            start += booking["quantity"]
+        return allocations
     
     def arrange_transport(self, action_input: str) -> str:
         """
         action_input = {
             "airport": "ORD",
             "crew_ids": ["C001", "C002"],
-            "hotel": "Airport Inn"
+            "hotel": "Airport Inn",
+            "hold_minutes": 15  // optional, places a tentative hold instead of booking
         }
         """
         try:
@@ -360,29 +1447,275 @@ class StatusQueryTools():
 
         seats_needed = len(crew_ids)
 
-        available_pickup = self.transport_df[
-            (self.transport_df['airport'] == airport) &
-            (self.transport_df['seats_available'] >= seats_needed)
-        ]
+        booking = self.reservations.hold_any(
+            "transport", airport, seats_needed, owner=crew_ids, ttl_seconds=self._hold_ttl(params)
+        )
+
+        if booking is None:
+            return json.dumps({"message": "No suitable transport available"})
 
-        if available_pickup.empty:
-            return json.dumsp({"message": "No suitable transport available"})
-        
-        selected_pickup = available_pickup["service_name"].iloc[0]
         result = {
-                    "service": selected_pickup,
+                    "service": booking["name"],
                     "seats_booked": seats_needed,
                     "hotel": hotel,
                     "crew_ids": crew_ids,
-                    "message": "Transport arranged successfully"
+                    **self._finish_booking(booking, "Transport arranged successfully")
                 }
 
         return json.dumps(result)
     
+    def arrange_pooled_transport(self, action_input: str) -> str:
+        """
+        action_input = {
+            "requests": [
+                {"flight_id": "UA123", "airport": "ORD", "hotel": "Airport Inn",
+                 "crew_ids": ["C001", "C002"], "ready_time": "2024-08-10 17:40"},
+                ...
+            ],
+            "window_minutes": 20,   // optional, how long a pooled vehicle waits for more crews
+            "hold_minutes": 15      // optional, places tentative holds instead of bookings
+        }
+        Requests for the same airport and hotel that are ready within window_minutes
+        of each other share vehicles, packed first-fit decreasing into the transport
+        services at the airport.
+        """
+        try:
+            params = json.loads(action_input)
+        except json.JSONDecodeError:
+            return json.dumps({"error": "Invalid input format"})
+
+        requests = params.get("requests") or []
+        if not requests:
+            return json.dumps({"error": "Missing requests"})
+        for request in requests:
+            if not request.get("airport") or not request.get("hotel") or not request.get("crew_ids") or not request.get("ready_time"):
+                return json.dumps({"error": "Every request needs airport, hotel, crew_ids and ready_time"})
+
+        window_minutes = int(params.get("window_minutes", POOL_WINDOW_MINUTES))
+        ttl_seconds = self._hold_ttl(params)
+        pools, unplaced = [], []
+        for pool in pool_requests(requests, window_minutes):
+            airport = pool["airport"]
+            names = self.reservations.providers("transport", airport)
+            capacities = [self.reservations.available("transport", airport, name) for name in names]
+            sizes = [len(requests[index]["crew_ids"]) for index in pool["requests"]]
+            trips, left_out = pack_vehicles(sizes, capacities)
+
+            seated = {group: 0 for group in range(len(sizes))}
+            vehicles = []
+            for trip in trips:
+                crew_ids, flight_ids = [], []
+                for group, seats in trip["groups"]:
+                    request = requests[pool["requests"][group]]
+                    crew_ids.extend(request["crew_ids"][seated[group]:seated[group] + seats])
+                    flight_ids.append(request.get("flight_id"))
+                    seated[group] += seats
+
+                booking = self.reservations.hold(
+                    "transport", airport, names[trip["vehicle"]], trip["load"], owner=crew_ids, ttl_seconds=ttl_seconds
+                )
+                if booking is None:
+                    left_out.extend(group for group, _ in trip["groups"])
+                    continue
+                vehicles.append({
+                    "service": booking["name"],
+                    "seats_booked": trip["load"],
+                    "crew_ids": crew_ids,
+                    "flight_ids": list(dict.fromkeys(flight_ids)),
+                    **self._finish_booking(booking, "Transport arranged successfully")
+                })
+
+            unplaced.extend(requests[pool["requests"][group]].get("flight_id") for group in dict.fromkeys(left_out))
+            pools.append({
+                "airport": airport,
+                "hotel": pool["hotel"],
+                "departs": format_time(pool["departs"]),
+                "vehicles": vehicles,
+            })
+
+        return json.dumps({
+            "pools": pools,
+            "unplaced_flight_ids": unplaced,
+            "message": f"{sum(len(pool['vehicles']) for pool in pools)} vehicles for {len(requests)} requests"
+        })
+
+    def book_reposition_seat(self, action_input: str) -> str:
+        """
+        action_input = {
+            "flight_id": "UA9003",
+            "crew_id": "C010",
+            "hold_minutes": 15  // optional, places a tentative hold instead of booking
+        }
+        """
+        try:
+            params = json.loads(action_input)
+        except json.JSONDecodeError:
+            return json.dumps({"error": "Invalid input format"})
+
+        flight_id = params.get("flight_id")
+        crew_id = params.get("crew_id")
+
+        if not flight_id or not crew_id:
+            return json.dumps({"error": "Missing flight_id or crew_id"})
+
+        position = self.reposition_index.flight_position.get(flight_id)
+        if position is None:
+            return json.dumps({"error": f"Reposition flight {flight_id} not found"})
+
+        origin = self.reposition_flight_df["origin"].iloc[position]
+        booking = self.reservations.hold(
+            "reposition_seat", origin, flight_id, 1, owner=[crew_id], ttl_seconds=self._hold_ttl(params)
+        )
+        if booking is None:
+            return json.dumps({"message": f"No seats left on reposition flight {flight_id}"})
+
+        self._sync_reposition_seats(origin, flight_id)
+
+        return json.dumps({
+            "flight_id": flight_id,
+            "crew_id": crew_id,
+            "seats_remaining": self.reposition_index.seats_for(flight_id),
+            **self._finish_booking(booking, "Reposition seat booked successfully")
+        })
+
+    def confirm_reservation(self, action_input: str) -> str:
+        """
+        action_input = {
+            "reservation_id": "ORD-1"
+        }
+        Confirms a tentative hold placed with hold_minutes before it expires.
+        """
+        try:
+            params = json.loads(action_input)
+        except json.JSONDecodeError:
+            return json.dumps({"error": "Invalid input format"})
+
+        reservation_id = params.get("reservation_id")
+        if not reservation_id:
+            return json.dumps({"error": "Missing reservation_id"})
+
+        confirmed = self.reservations.confirm(reservation_id)
+        if confirmed is None:
+            return json.dumps({"message": f"Reservation {reservation_id} not found or expired"})
+
+        return json.dumps({
+            "reservation_id": reservation_id,
+            "confirmed": confirmed["name"],
+            "quantity": confirmed["quantity"],
+            "message": "Reservation confirmed"
+        })
+
+    def release_reservation(self, action_input: str) -> str:
+        """
+        action_input = {
+            "reservation_id": "ORD-1"
+        }
+        Cancels a hotel, transport or reposition seat booking and returns the inventory.
+        """
+        try:
+            params = json.loads(action_input)
+        except json.JSONDecodeError:
+            return json.dumps({"error": "Invalid input format"})
+
+        reservation_id = params.get("reservation_id")
+        if not reservation_id:
+            return json.dumps({"error": "Missing reservation_id"})
+
+        kind = (self.reservations.get_hold(reservation_id) or {"kind": "hotel"})["kind"]
+        if kind == "hotel":
+            released = self._release_hotel_stay(reservation_id)
+        else:
+            released = self.reservations.release(reservation_id)
+            if released is not None:
+                if kind == "reposition_seat":
+                    self._sync_reposition_seats(released["airport"], released["name"])
+                released = released["name"], released["quantity"]
+
+        if released is None:
+            return json.dumps({"message": f"Reservation {reservation_id} not found"})
+
+        return json.dumps({
+            "reservation_id": reservation_id,
+            "released": released[0],
+            "quantity": released[1],
+            "message": "Reservation released"
+        })
+
+    def _hold_ttl(self, params):
+        """
+        Seconds a tentative hold should live, or None for an immediately confirmed booking.
+        """
+        hold_minutes = params.get("hold_minutes")
+        return None if hold_minutes is None else float(hold_minutes) * 60
+
+    def _finish_booking(self, booking, message):
+        """
+        Confirms untimed bookings straight away; tentative holds stay pending until
+        confirm_reservation. Returns the reservation fields for the tool output.
+        """
+        if booking["expires_at"] is None:
+            self.reservations.confirm(booking["hold_id"])
+            return {"reservation_id": booking["hold_id"], "message": message}
+
+        return {
+            "reservation_id": booking["hold_id"],
+            "status": "held",
+            "hold_minutes": booking["ttl_seconds"] / 60,
+            "message": f"{message} as a tentative hold; confirm with confirm_reservation before it expires"
+        }
+
+    def _build_hotel_preferences(self):
+        """
+        Precomputes the order hotels are tried in at each airport: by the optional
+        preference column of hotels_df (lowest first), otherwise as listed.
+        """
+        self.hotel_preference = dict()
+        if self.hotels_df is None:
+            return
+        ranked = self.hotels_df
+        if "preference" in ranked.columns:
+            ranked = ranked.sort_values(["airport", "preference"], kind="stable")
+        for airport, hotels in ranked.groupby("airport", sort=False):
+            self.hotel_preference[airport] = hotels["hotel_name"].tolist()
+            if "preference" in ranked.columns:
+                self.reservations.set_preference("hotel", airport, self.hotel_preference[airport])
+
+    def _calendar_start(self):
+        """
+        First night of the room-night calendar: the day of the earliest scheduled departure.
+        """
+        departures = self.flight_times["sched_dep"]
+        departures = departures[~np.isnat(departures)]
+        if departures.size == 0:
+            return np.datetime64("today", "D")
+        return departures.min().astype("datetime64[D]")
+
+    def _expire_holds(self):
+        """
+        Returns every due tentative hold to inventory before a tool reads seat counts.
+        The reposition index only hears of an expired seat hold through
+        _on_reservation_expired, and the engine only expires a partition when it is
+        touched, so readers of reposition_index.seats call this first.
+        """
+        self.reservations.expire()
+
+    def _on_reservation_expired(self, hold):
+        if hold["kind"] == "reposition_seat":
+            self._sync_reposition_seats(hold["airport"], hold["name"])
+        elif hold["kind"] == "hotel" and hold["hold_id"] in self.hotel_stays:
+            # the first night went back to the engine; the later nights go with it
+            self.hotel_calendar.release(self.hotel_stays.pop(hold["hold_id"]))
+
+    def _sync_reposition_seats(self, origin, flight_id):
+        self.reposition_index.set_seats(
+            flight_id, self.reservations.available("reposition_seat", origin, flight_id)
+        )
+
     def policy_retriever(self, action_input: str) -> str:
         """
         action_input = {
-            "topic": "crew disruption at ORD"
+            "topic": "crew disruption at ORD",
+            "top_k": 3   // optional
         }
         """
         try:
@@ -390,24 +1723,190 @@ class StatusQueryTools():
         except json.JSONDecodeError:
             return json.dumps({"error": "Invalid input format"})
 
-        topic = params.get("topic")
+        topic = params.get("topic") or params.get("policy_query")
         if not topic:
             return json.dumps({"error": "Missing topic"})
 
-        matched = self.policies_df[self.policies_df["topic"] == topic]
+        try:
+            top_k = int(params.get("top_k", 3))
+        except (TypeError, ValueError):
+            return json.dumps({"error": "top_k must be an integer"})
 
-        if matched.empty:
+        hits = self.policy_index.search(topic, top_k)
+
+        if not hits:
             return json.dumps({"message": "No policy found for requested topic"})
 
-        policy_text = matched["policy"].iloc[0]
+        policies = [
+            {
+                "topic": self.policies_df["topic"].iloc[row],
+                "policy": self.policies_df["policy"].iloc[row],
+                "score": round(score, 4),
+            }
+            for row, score in hits
+        ]
 
         result = {
-            "policy": policy_text,
+            "policy": policies[0]["policy"],
+            "policies": policies,
             "message": "Policy retrieved successfully"
         }
 
         return json.dumps(result)
     
+    def plan_network_recovery(self, action_input: str) -> str:
+        """
+        action_input = {
+            "flight_ids": ["UA123"],   // optional, defaults to every delayed flight
+            "report_buffer": 60,
+            "min_connection_minutes": 45   // optional
+        }
+        Finds every crew position made illegal by the delays and assigns spares to all
+        of them at once with a min-cost bipartite assignment, instead of resolving each
+        flight greedily. Returns a plan only; nothing is booked or assigned.
+        """
+        try:
+            params = json.loads(action_input)
+        except json.JSONDecodeError:
+            return json.dumps({"error": "Invalid input format"})
+
+        if params.get("report_buffer") is None:
+            return json.dumps({"error": "Missing report_buffer"})
+
+        report_buffer = np.timedelta64(int(params["report_buffer"]), "m")
+        min_connection_minutes = int(params.get("min_connection_minutes", MIN_CONNECTION_MINUTES))
+        schedule = self.flight_schedule_df
+        delays = self.flight_delays
+
+        flight_ids = params.get("flight_ids")
+        if flight_ids is None:
+            flight_positions = np.flatnonzero(delays > 0)
+        else:
+            missing = [flight_id for flight_id in flight_ids if flight_id not in self.flight_row_index]
+            if missing:
+                return json.dumps({"error": f"Flight {missing[0]} not found"})
+            flight_positions = np.array([self.flight_row_index[flight_id] for flight_id in flight_ids], dtype=np.int64)
+
+        # every crew member on the affected flights, checked for legality in one pass
+        crew_positions, crew_flights = [], []
+        for flight_position in flight_positions:
+            assigned = self.flight_crew_index.get(schedule["flight_id"].iloc[flight_position], [])
+            crew_positions.extend(assigned)
+            crew_flights.extend([flight_position] * len(assigned))
+        crew_positions = np.array(crew_positions, dtype=np.int64)
+        crew_flights = np.array(crew_flights, dtype=np.int64)
+
+        delay = delays[crew_flights].astype("timedelta64[m]")
+        projected_arrival = self.flight_times["sched_arr"][crew_flights] + delay
+        illegal = self.crew_times["duty_end"][crew_positions] < projected_arrival
+        illegal |= ~self._fdp_legality(crew_positions, projected_arrival, self.flight_times["sched_arr"][crew_flights])[2]
+        open_crew = crew_positions[illegal]
+        open_flights = crew_flights[illegal]
+
+        if open_crew.size == 0:
+            return json.dumps({"assignments": [], "uncovered": [], "message": "No open crew positions"})
+
+        store = self.roster_store
+        spare_positions = np.flatnonzero(
+            self._spare_mask() & ~store.missing("role") & ~store.missing("qualified_aircraft") & ~store.missing("base")
+        )
+
+        # the store's category codes are shared by both sides, so the feasibility
+        # kernel compares small ints; positions with an unknown role or aircraft
+        # type get -1 for both and can never match a spare
+        position_role = store.codes["role"][open_crew].astype(np.int64)
+        position_aircraft = store.encode("qualified_aircraft", schedule["aircraft_type"].to_numpy()[open_flights])
+        unknown = (position_role < 0) | (position_aircraft < 0)
+        origins = schedule["origin"].to_numpy()[open_flights]
+        airports = store.categories["base"]
+
+        spare = {
+            "role_code": store.codes["role"][spare_positions],
+            "aircraft_code": store.codes["qualified_aircraft"][spare_positions],
+            "base_code": store.codes["base"][spare_positions],
+            "ready": self.crew_times["rest_until"][spare_positions],
+        }
+        position = {
+            "role_code": np.where(unknown, -1, position_role),
+            "aircraft_code": np.where(unknown, -1, position_aircraft),
+            "airport_code": store.encode("base", origins),
+            "report_time": (
+                self.flight_times["sched_dep"][open_flights]
+                + delays[open_flights].astype("timedelta64[m]")
+                - report_buffer
+            ),
+            "projected_arrival": projected_arrival[illegal],
+        }
+
+        # one reverse connection scan per distinct (airport, report time)
+        group_keys = list(zip(origins, position["report_time"]))
+        groups = {key: index for index, key in enumerate(dict.fromkeys(group_keys))}
+        position["group"] = np.array([groups[key] for key in group_keys], dtype=np.int64)
+        unreachable = np.iinfo(np.int64).min
+        reposition = {
+            "latest_departure": np.full((len(groups), len(airports)), unreachable),
+            "arrival": np.full((len(groups), len(airports)), unreachable),
+            "legs": np.zeros((len(groups), len(airports)), dtype=np.int64),
+        }
+        sched_arr_minutes = self.reposition_times["sched_arr"].astype(np.int64)
+        self._expire_holds()
+        group_routes = []
+        for (airport, report_time), group in groups.items():
+            routes = self.reposition_router.latest_departures(airport, report_time, min_connection_minutes)
+            group_routes.append(routes)
+            for base_code, base in enumerate(airports):
+                if base in routes:
+                    reposition["latest_departure"][group, base_code] = routes[base]["departure"]
+                    reposition["arrival"][group, base_code] = sched_arr_minutes[routes[base]["legs"][-1]]
+                    reposition["legs"][group, base_code] = len(routes[base]["legs"])
+
+        feasible, cost, duty_remaining = feasibility_matrix(spare, position, reposition)
+
+        # spares whose own future assignments overlap the position are not available
+        spare_index, position_index = np.nonzero(feasible)
+        if spare_index.size:
+            conflict = self.assignment_timeline.check_batch(
+                store.crew_ids[spare_positions[spare_index]],
+                position["report_time"][position_index],
+                position["projected_arrival"][position_index],
+                MIN_TURN_MINUTES,
+            )["conflict"]
+            feasible[spare_index[conflict], position_index[conflict]] = False
+            cost[spare_index[conflict], position_index[conflict]] = INFEASIBLE_COST
+        assignment = assign_spares(cost.T)
+
+        assignments, uncovered = [], []
+        for index, spare_column in enumerate(assignment):
+            replaced = store.record(open_crew[index], ["crew_id", "role"])
+            entry = {
+                "flight_id": schedule["flight_id"].iloc[open_flights[index]],
+                "role": replaced["role"],
+                "replaces_crew_id": replaced["crew_id"],
+                "report_time": format_time(position["report_time"][index]),
+            }
+            if spare_column < 0:
+                uncovered.append(entry)
+                continue
+
+            spare_row = store.record(spare_positions[spare_column], ["crew_id", "base"])
+            itinerary = []
+            if spare["base_code"][spare_column] != position["airport_code"][index]:
+                legs = group_routes[position["group"][index]][spare_row["base"]]["legs"]
+                itinerary = self.reposition_flight_df["flight_id"].iloc[legs].tolist()
+            entry.update({
+                "spare_crew_id": spare_row["crew_id"],
+                "spare_base": spare_row["base"],
+                "reposition_flight_ids": itinerary,
+                "duty_remaining_minutes": int(duty_remaining[spare_column, index]),
+            })
+            assignments.append(entry)
+
+        return json.dumps({
+            "assignments": assignments,
+            "uncovered": uncovered,
+            "message": f"{len(assignments)} of {len(open_crew)} open positions covered"
+        })
+
     def send_notification(self, action_input: str) -> str:
         """
         action_input = {
@@ -447,7 +1946,7 @@ class RuleEvaluatorAgents():
 
 
 if __name__ == "__main__":
-    from mock_data import crew_roster_df, repositioning_flights_df, flight_schedule_df, hotels_df, transport_df, policies_df
+    from mock_data import crew_roster_df, repositioning_flights_df, flight_schedule_df, hotels_df, transport_df, policies_df, crew_assignments_df
 
     test_status_query_agent = StatusQueryTools(
         crew_roster_df=crew_roster_df,
@@ -455,7 +1954,8 @@ if __name__ == "__main__":
         repositioning_flights_df=repositioning_flights_df,
         hotels_df = hotels_df,
         transport_df=transport_df,
-        policies_df=policies_df
+        policies_df=policies_df,
+        crew_assignments_df=crew_assignments_df
     )
 
     duty_hour_checker_result = test_status_query_agent.duty_hour_checker("""{"crew_ids": ["C001", "C002"],
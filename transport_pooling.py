@@ -0,0 +1,102 @@
+import bisect
+
+import numpy as np
+
+from time_utils import parse_time_column
+
+POOL_WINDOW_MINUTES = 20
+
+
+def pool_requests(requests, window_minutes=POOL_WINDOW_MINUTES):
+    """
+    Groups transport requests that can share vehicles: same airport and hotel, and
+    ready within window_minutes of the first request of the pool. One sort and one
+    sweep, so pooling is O(n log n).
+
+    Args:
+        requests (list of dict): each with airport, hotel, ready_time and crew_ids
+
+    Returns:
+        list of dict: { airport, hotel, departs (latest ready_time in the pool),
+        requests: [request index, ...] }, in departure order
+    """
+    ready = parse_time_column([request["ready_time"] for request in requests]).astype(np.int64).tolist()
+    keys = [(request["airport"], request["hotel"]) for request in requests]
+    order = sorted(range(len(requests)), key=lambda index: (keys[index], ready[index]))
+
+    pools = []
+    for index in order:
+        current = pools[-1] if pools else None
+        if current is None or current["key"] != keys[index] or ready[index] - current["opens"] > window_minutes:
+            current = {"key": keys[index], "opens": ready[index], "requests": []}
+            pools.append(current)
+        current["requests"].append(index)
+        current["departs"] = ready[index]
+
+    pools.sort(key=lambda pool: pool["departs"])
+    return [
+        {
+            "airport": pool["key"][0],
+            "hotel": pool["key"][1],
+            "departs": np.datetime64(pool["departs"], "m"),
+            "requests": pool["requests"],
+        }
+        for pool in pools
+    ]
+
+
+def pack_vehicles(sizes, capacities):
+    """
+    First-fit decreasing bin packing of crew groups into vehicles. Groups go into
+    the first open vehicle with room, a new vehicle is the largest one left, and a
+    group larger than that is split over several new vehicles. A group that the
+    vehicles left cannot seat is not placed at all. Once packed, every vehicle is
+    swapped for the smallest unused one its load still fits in.
+
+    Args:
+        sizes (list of int): seats needed per group
+        capacities (list of int): seats per available vehicle
+
+    Returns:
+        (list of dict, list of int): vehicles used as { vehicle, load, groups:
+        [(group index, seats), ...] }, and the indices of groups that did not fit
+    """
+    unused = sorted((capacity, vehicle) for vehicle, capacity in enumerate(capacities) if capacity > 0)
+    unused_seats = sum(capacity for capacity, _ in unused)
+    trips = []
+    unplaced = []
+
+    for group in sorted(range(len(sizes)), key=lambda index: -sizes[index]):
+        remaining = sizes[group]
+        for trip in trips:
+            if trip["room"] >= remaining:
+                trip["groups"].append((group, remaining))
+                trip["room"] -= remaining
+                remaining = 0
+                break
+
+        if remaining > unused_seats:
+            unplaced.append(group)
+            continue
+
+        while remaining > 0:
+            capacity, vehicle = unused.pop()
+            unused_seats -= capacity
+            seats = min(capacity, remaining)
+            trips.append({"vehicle": vehicle, "capacity": capacity, "room": capacity - seats, "groups": [(group, seats)]})
+            remaining -= seats
+
+    # right-size: fullest trips first, each takes the smallest unused vehicle that fits
+    for trip in sorted(trips, key=lambda trip: trip["room"]):
+        load = trip["capacity"] - trip["room"]
+        position = bisect.bisect_left(unused, (load, -1))
+        if position < len(unused) and unused[position][0] < trip["capacity"]:
+            smaller = unused.pop(position)
+            bisect.insort(unused, (trip["capacity"], trip["vehicle"]))
+            trip["capacity"], trip["vehicle"] = smaller
+            trip["room"] = trip["capacity"] - load
+
+    return [
+        {"vehicle": trip["vehicle"], "load": trip["capacity"] - trip["room"], "groups": trip["groups"]}
+        for trip in trips
+    ], unplaced